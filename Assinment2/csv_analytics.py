@@ -0,0 +1,1388 @@
+"""CSV column statistics: analyze_csv and its streaming helpers.
+
+Importing this module has no side effects and does not import pandas or
+NumPy; they are loaded on first use by the functions that need them, so
+worker processes and scripts that never parse a file start quickly.
+
+analyze_csv reads the whole file by default. For files too large for
+that, the helpers here read it in chunks of rows instead and fold each
+chunk into a small per-column accumulator (ColumnStats), so peak memory
+depends on the chunk size only.
+
+Accumulators keep count, sum, min, max, mean and M2 (the sum of squared
+deviations from the mean). Means and variances are updated with Welford's
+method and combined with Chan et al.'s pairwise formula, which stays
+numerically stable where the naive sum-of-squares formula cancels.
+Because merging is associative, analyze_many() can compute partial
+statistics for many files in a process pool and combine them afterwards,
+and incremental_stats() can keep the state of an append-only file in a
+sidecar cache and fold in only the rows appended since the last call.
+
+With sketches enabled each column also carries a KLL quantile sketch and
+a HyperLogLog distinct counter (see sketches.py); both merge the same way,
+so approximate percentiles come without a full in-memory sort.
+
+read_numeric() is the fast path for whole-file reads: it sniffs the first
+rows to find the numeric columns, then parses only those (with the pyarrow
+engine when it is installed) instead of every column. numeric_columns()
+can also keep those columns as .npy files next to the CSV and memory-map
+them on later runs, skipping text parsing altogether.
+
+For small files importing pandas costs more than the analysis, so
+python_stats() parses with the csv module alone; analyze_csv picks it
+automatically below PYTHON_ENGINE_MAX_BYTES, unless pandas is already
+imported.
+
+gzip, bz2, xz and (with the zstandard package) zstd files are recognised
+by their magic bytes and read directly: a background thread decompresses
+into a bounded queue of blocks while the parser consumes them, so no
+temporary file is written and decompression overlaps parsing.
+"""
+
+import copy
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import math
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sketches import HyperLogLog, KLLSketch
+
+# Set by _pandas() on first use.
+pd = None
+np = None
+
+# Rows per chunk when streaming: a few MB per numeric column.
+DEFAULT_CHUNKSIZE = 100_000
+
+# Rows read by sniff_schema() to decide which columns are numeric.
+DEFAULT_SNIFF_ROWS = 1000
+
+# analyze_csv(engine='auto') uses the pure-Python engine for files smaller
+# than this; above it pandas' C parser wins back its import cost (measured
+# crossover about 1 MiB, see benchmarks/bench_csv_engines.py). Once pandas
+# is imported it is faster at every size, so auto always picks it then.
+PYTHON_ENGINE_MAX_BYTES = 1 << 20
+
+# Decompressed bytes per block handed from the reader thread to the parser,
+# and how many blocks may wait in the queue (bounding memory to ~8 MiB).
+DECOMPRESS_BLOCK_SIZE = 1 << 20
+DECOMPRESS_QUEUE_DEPTH = 8
+
+# Compressed files are assumed to expand about this much when choosing an
+# engine by file size.
+_COMPRESSION_RATIO = 4
+
+_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+# Strings pd.read_csv treats as missing by default.
+_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+])
+
+# analyze_csv(group_by=...) keeps at most this many groups in memory before
+# spilling them to disk, and spreads spilled groups over this many files.
+DEFAULT_MAX_GROUPS = 100_000
+_SPILL_PARTITIONS = 64
+
+_INT64_MIN = -(1 << 63)
+_INT64_END = 1 << 63
+_UINT64_END = 1 << 64
+
+# Bytes at the start of a file whose checksum detects a rewrite (as opposed
+# to an append) between incremental_stats() calls.
+HEAD_BYTES = 1 << 16
+
+# Version 3: caches from earlier versions may wrongly exclude every column
+# after an empty chunk, so they are rebuilt.
+_CACHE_VERSION = 3
+_COLUMN_CACHE_VERSION = 1
+
+
+def _pandas():
+    """Import pandas and NumPy on first use and return pandas."""
+    global pd, np
+    if pd is None:
+        import numpy
+        import pandas
+        np, pd = numpy, pandas
+    return pd
+
+
+def _plain(value):
+    """Convert a NumPy scalar to the equivalent Python number for JSON."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+class ColumnStats:
+    """Running count, sum, min, max, mean and M2 for one numeric column.
+
+    Values are folded in one at a time with add() or a chunk at a time with
+    update(); two accumulators combine with merge(). The result does not
+    depend on how the data was split, up to floating-point rounding. Once
+    the total is infinite (or nan, from +inf and -inf) the mean is
+    total / count, as in pandas, and M2 is nan.
+
+    With sketches=True it also feeds a KLLSketch (approximate quantiles)
+    and a HyperLogLog (approximate distinct count), about 9 KB in total.
+
+    Example:
+        >>> s = ColumnStats()
+        >>> for x in (2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0):
+        ...     s.add(x)
+        >>> s.mean, s.variance(ddof=0)
+        (5.0, 4.0)
+    """
+
+    def __init__(self, sketches=False):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quantile_sketch = KLLSketch() if sketches else None
+        self.distinct = HyperLogLog() if sketches else None
+
+    def add(self, x):
+        """Fold in a single value (Welford's update)."""
+        self.count += 1
+        self.total += x
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+        if not math.isfinite(self.total):
+            # inf - inf in the update below would make the mean nan
+            self.mean, self.m2 = self.total / self.count, math.nan
+            return
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.quantile_sketch is not None:
+            self.quantile_sketch.add(x)
+            self.distinct.add(x)
+
+    def update(self, values):
+        """Fold in a pandas Series of values; missing values are skipped.
+
+        The chunk's own moments are computed with vectorised NumPy calls
+        and then merged, so the cost per row is C-level. Sums are taken in
+        float64: summing an int64 or uint64 column in its own dtype wraps
+        around silently (epoch-nanosecond timestamps overflow at ten rows).
+        """
+        values = values.dropna()
+        if values.empty:
+            return self
+        floats = values.to_numpy(dtype='float64')
+        chunk = ColumnStats()
+        chunk.count = len(floats)
+        chunk.total = float(floats.sum())
+        chunk.min = values.min()
+        chunk.max = values.max()
+        chunk.mean = chunk.total / chunk.count
+        if math.isfinite(chunk.total):
+            chunk.m2 = float(((floats - chunk.mean) ** 2).sum())
+        else:
+            chunk.m2 = math.nan
+        if self.quantile_sketch is not None:
+            self.quantile_sketch.update_many(floats)
+            self.distinct.update_many(floats)
+        return self._merge_moments(chunk)
+
+    def merge(self, other):
+        """Combine another accumulator into this one and return self.
+
+        Sketches survive only if both sides have them; otherwise they would
+        describe part of the data and are dropped.
+        """
+        if other.count == 0:
+            return self
+        if self.quantile_sketch is not None:
+            if other.quantile_sketch is None:
+                self.quantile_sketch = self.distinct = None
+            else:
+                self.quantile_sketch.merge(other.quantile_sketch)
+                self.distinct.merge(other.distinct)
+        return self._merge_moments(other)
+
+    def _merge_moments(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.total = other.count, other.total
+            self.min, self.max = other.min, other.max
+            self.mean, self.m2 = other.mean, other.m2
+            return self
+        count = self.count + other.count
+        if not math.isfinite(self.total + other.total):
+            self.count, self.total = count, self.total + other.total
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.mean, self.m2 = self.total / count, math.nan
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=1):
+        """Return the variance (sample variance by default, like pandas)."""
+        if self.count - ddof <= 0:
+            return math.nan
+        return self.m2 / (self.count - ddof)
+
+    def to_state(self):
+        """Return the accumulator as a JSON-serialisable dict."""
+        state = {
+            'count': self.count, 'total': self.total,
+            'min': _plain(self.min), 'max': _plain(self.max),
+            'mean': self.mean, 'm2': self.m2,
+        }
+        if self.quantile_sketch is not None:
+            state['quantile_sketch'] = self.quantile_sketch.to_state()
+            state['distinct'] = self.distinct.to_state()
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an accumulator saved with to_state()."""
+        stats = cls()
+        stats.count, stats.total = state['count'], state['total']
+        stats.min, stats.max = state['min'], state['max']
+        stats.mean, stats.m2 = state['mean'], state['m2']
+        if 'quantile_sketch' in state:
+            stats.quantile_sketch = KLLSketch.from_state(state['quantile_sketch'])
+            stats.distinct = HyperLogLog.from_state(state['distinct'])
+        return stats
+
+    def summary(self, quantiles=()):
+        """Return {'mean', 'min', 'max'} in the shape analyze_csv uses.
+
+        With sketches, 'quantiles' ({q: approximate value} for each q in
+        `quantiles`) and 'distinct' (approximate distinct count) are added.
+        """
+        if self.count == 0:
+            result = {'mean': math.nan, 'min': math.nan, 'max': math.nan}
+        else:
+            result = {'mean': self.mean, 'min': self.min, 'max': self.max}
+        if self.quantile_sketch is not None:
+            values = self.quantile_sketch.quantiles(quantiles)
+            result['quantiles'] = dict(zip(quantiles, values))
+            result['distinct'] = self.distinct.estimate()
+        return result
+
+
+def _compression(file_path):
+    """Return 'gzip', 'bz2', 'xz' or 'zstd' from the file's magic bytes, or None."""
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def _decompressed_stream(file_path, codec):
+    """Open a binary stream of the decompressed contents of file_path."""
+    if codec == 'gzip':
+        import gzip
+        return gzip.open(file_path, 'rb')
+    if codec == 'bz2':
+        import bz2
+        return bz2.open(file_path, 'rb')
+    if codec == 'xz':
+        import lzma
+        return lzma.open(file_path, 'rb')
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(f"{file_path} is zstd-compressed; install the zstandard package") from None
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Raw reader fed by a thread that decompresses ahead of the consumer.
+
+    The thread reads DECOMPRESS_BLOCK_SIZE blocks into a queue holding at
+    most DECOMPRESS_QUEUE_DEPTH of them. zlib, bz2, lzma and zstandard
+    release the GIL while decompressing, so the thread keeps working while
+    the parser runs. Errors in the thread are re-raised by readinto().
+    """
+
+    def __init__(self, file_path, codec):
+        self._queue = queue.Queue(DECOMPRESS_QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._produce, args=(file_path, codec), name='csv-decompress', daemon=True,
+        )
+        self._thread.start()
+
+    def _produce(self, file_path, codec):
+        try:
+            with _decompressed_stream(file_path, codec) as stream:
+                while not self._stop.is_set():
+                    block = stream.read(DECOMPRESS_BLOCK_SIZE)
+                    if not block:
+                        break
+                    self._put(block)
+        except BaseException as exc:  # handed to the reading thread
+            self._put(exc)
+            return
+        self._put(None)
+
+    def _put(self, item):
+        # poll so close() can stop a producer blocked on a full queue
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def _open_compressed(file_path, codec):
+    return io.BufferedReader(_ThreadedReader(file_path, codec), DECOMPRESS_BLOCK_SIZE)
+
+
+@contextmanager
+def _open_source(file_path):
+    """Yield what pd.read_csv should read: the path, or a decompressing reader."""
+    codec = _compression(file_path)
+    if codec is None:
+        yield file_path
+        return
+    reader = _open_compressed(file_path, codec)
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+def _open_text(file_path):
+    """Open file_path as text for the csv module, decompressing if needed."""
+    codec = _compression(file_path)
+    if codec is None:
+        return open(file_path, newline='', encoding='utf-8-sig')
+    return io.TextIOWrapper(_open_compressed(file_path, codec), encoding='utf-8-sig', newline='')
+
+
+def sniff_schema(file_path, nrows=DEFAULT_SNIFF_ROWS):
+    """
+    Guess the numeric columns of a CSV file from its first rows.
+
+    A column that is not numeric in the first rows cannot become numeric
+    in the whole file, so the columns left out here are safe to skip. The
+    reverse is not guaranteed (text may appear later); read_numeric()
+    checks that.
+
+    Args:
+        file_path (str): Path to the CSV file
+        nrows (int): Number of rows to sample
+
+    Returns:
+        dict: {column: dtype} for the columns select_dtypes(include=[np.number])
+        keeps in the sample, in file order
+    """
+    _pandas()
+    with _open_source(file_path) as source:
+        sample = pd.read_csv(source, nrows=nrows)
+    return {col: sample[col].dtype for col in sample.select_dtypes(include=[np.number]).columns}
+
+
+def _implicit_index(file_path):
+    """True when the first row has one field more than the header.
+
+    pd.read_csv then reads the first field of every row as an unnamed
+    index, unless `usecols` is given.
+    """
+    with _open_text(file_path) as f:
+        rows = (row for row in csv.reader(f) if row)
+        header, first = next(rows, None), next(rows, None)
+    return first is not None and len(first) == len(header) + 1
+
+
+def read_numeric(file_path, sniff_rows=DEFAULT_SNIFF_ROWS):
+    """
+    Read only the numeric columns of a CSV file.
+
+    Text columns are pruned with `usecols` and float columns are pinned to
+    float64, so the parser does no type inference or string allocation for
+    them. Integer columns are left to inference, since a missing value
+    later in the file would not fit int64. The pyarrow engine
+    (multi-threaded) is tried first when installed, then the C engine; if
+    the sniffed schema turns out wrong, the file is read the old way. So
+    is a file whose rows have one field more than the header (a trailing
+    comma, say): `usecols` would turn off pandas' implicit index column
+    and shift the values under different names.
+
+    Args:
+        file_path (str): Path to the CSV file
+        sniff_rows (int): Rows sampled by sniff_schema
+
+    Returns:
+        DataFrame: The numeric columns, as select_dtypes(include=[np.number])
+        would return them from a full read
+    """
+    _pandas()
+    schema = sniff_schema(file_path, sniff_rows)
+    if not schema:
+        return pd.DataFrame()
+    dtype = {col: 'float64' for col, kind in schema.items() if kind.kind == 'f'}
+    if _implicit_index(file_path):
+        engines = []  # straight to the full read below
+    elif importlib.util.find_spec('pyarrow'):
+        engines = ['pyarrow', 'c']
+    else:
+        engines = ['c']
+    for engine in engines:
+        try:
+            with _open_source(file_path) as source:
+                df = pd.read_csv(source, usecols=list(schema), dtype=dtype, engine=engine)
+        except (ValueError, TypeError, NotImplementedError, ImportError):
+            # text in a sniffed column, or an option this engine lacks
+            continue
+        return df.select_dtypes(include=[np.number])
+    with _open_source(file_path) as source:
+        df = pd.read_csv(source)
+    return df.select_dtypes(include=[np.number])
+
+
+def stream_stats(
+    file_path,
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    sketches: bool = False,
+) -> Dict[str, ColumnStats]:
+    """
+    Read a CSV file in chunks and accumulate statistics per numeric column.
+
+    Numeric means what select_dtypes(include=[np.number]) keeps. pandas
+    infers dtypes per chunk, so a column that turns non-numeric in a later
+    chunk (text after numbers) is dropped, as it would be if the whole file
+    had been read at once.
+
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int): Rows per chunk; memory is proportional to this
+        sketches (bool): Also keep quantile and distinct-count sketches
+
+    Returns:
+        dict: {column: ColumnStats} for each numeric column, in file order
+    """
+    stats: Dict[str, ColumnStats] = {}
+    with _open_source(file_path) as source:
+        _accumulate(source, stats, set(), chunksize, sketches=sketches)
+    return stats
+
+
+def _accumulate(source, stats, excluded, chunksize, names=None, sketches=False):
+    """Fold the rows of `source` into `stats`; return the column names.
+
+    `excluded` collects columns found to be non-numeric. With `names` the
+    source has no header row (a tail of a file whose header was read
+    earlier). Empty chunks (a header alone, or only blank lines) say
+    nothing about column types: pandas returns them with every column as
+    object, so they are skipped rather than excluding everything.
+    """
+    _pandas()
+    chunksize = chunksize or DEFAULT_CHUNKSIZE
+    if names is None:
+        reader = pd.read_csv(source, chunksize=chunksize)
+    else:
+        reader = pd.read_csv(source, chunksize=chunksize, header=None, names=names)
+    for chunk in reader:
+        names = list(chunk.columns)
+        if len(chunk) == 0:
+            continue
+        numeric = set(chunk.select_dtypes(include=[np.number]).columns)
+        for col in chunk.columns:
+            if col in excluded:
+                continue
+            if col not in numeric:
+                excluded.add(col)
+                stats.pop(col, None)
+                continue
+            if col not in stats:
+                stats[col] = ColumnStats(sketches)
+            stats[col].update(chunk[col])
+    return names
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of an open binary file."""
+
+    def __init__(self, f, start, end):
+        self._f = f
+        self._pos = start
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self._end - self._pos)
+        if n <= 0:
+            return 0
+        self._f.seek(self._pos)
+        data = self._f.read(n)
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _byte_range(f, start, end):
+    return io.BufferedReader(_ByteRange(f, start, end), 1 << 20)
+
+
+def _complete_lines_end(f, size):
+    """Return the offset just past the last newline of f (0 if none)."""
+    end = size
+    while end > 0:
+        start = max(0, end - HEAD_BYTES)
+        f.seek(start)
+        i = f.read(end - start).rfind(b'\n')
+        if i >= 0:
+            return start + i + 1
+        end = start
+    return 0
+
+
+def _read_header(f, end):
+    """Column names from the first non-blank line of bytes [0, end) of f."""
+    with io.TextIOWrapper(_byte_range(f, 0, end), encoding='utf-8-sig', newline='') as text:
+        for row in csv.reader(text):
+            if row:
+                return _header_names(row)
+    return None
+
+
+def _head_checksum(f, length):
+    f.seek(0)
+    return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def _load_cache(cache_path, version=_CACHE_VERSION):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get('version') == version else None
+
+
+def _save_cache(cache_path, state):
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, cache_path)  # readers never see a half-written cache
+
+
+def incremental_stats(
+    file_path,
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    cache_path: Optional[str] = None,
+    sketches: bool = False,
+) -> Dict[str, ColumnStats]:
+    """
+    Statistics for an append-only CSV, parsing only what was appended.
+
+    The accumulated state is kept in a JSON sidecar (`cache_path`, default
+    "<file>.stats.json") together with the file's size, mtime, a checksum
+    of its first HEAD_BYTES bytes and the byte offset consumed so far. On
+    the next call, if the file only grew and its head is unchanged, just
+    the bytes after that offset are parsed and merged, so a refresh costs
+    O(new rows). Any other change (truncation, rewrite, or a new mtime
+    without growth) rebuilds the cache from scratch.
+
+    Only complete lines are committed to the cache: a trailing line without
+    a newline may still be being written, so it is included in the result
+    but parsed again next time. Records with quoted newlines must not
+    straddle that boundary. Compressed files are always parsed in full,
+    without a cache.
+
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int): Rows per chunk when parsing
+        cache_path (str, optional): Where to keep the sidecar cache
+        sketches (bool): Also keep quantile and distinct-count sketches;
+            a cache built without them is rebuilt
+
+    Returns:
+        dict: {column: ColumnStats} for each numeric column, in file order
+    """
+    _pandas()
+    if _compression(file_path) is not None:
+        # byte offsets into a compressed stream cannot be resumed cheaply
+        return stream_stats(file_path, chunksize, sketches)
+    cache_path = cache_path or file_path + '.stats.json'
+    st = os.stat(file_path)
+    cached = _load_cache(cache_path)
+    with open(file_path, 'rb') as f:
+        end = _complete_lines_end(f, st.st_size)
+        fresh = (
+            cached is not None
+            and cached['path'] == os.path.abspath(file_path)
+            and cached['sketches'] == sketches
+            # same size and a new mtime means rewritten in place, not appended
+            and (cached['size'] < st.st_size or cached['mtime_ns'] == st.st_mtime_ns)
+            and cached['offset'] <= end
+            and cached['head'] == _head_checksum(f, cached['head_len'])
+        )
+        unchanged = fresh and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns
+
+        if fresh:
+            stats = {col: ColumnStats.from_state(s) for col, s in cached['columns'].items()}
+            excluded = set(cached['excluded'])
+            names: Optional[List[str]] = cached['names']
+            if not unchanged and end > cached['offset']:
+                with _byte_range(f, cached['offset'], end) as tail:
+                    try:
+                        _accumulate(tail, stats, excluded, chunksize, names, sketches)
+                    except pd.errors.EmptyDataError:  # only blank lines appended
+                        pass
+        else:
+            stats, excluded, names = {}, set(), None
+            if end:
+                with _byte_range(f, 0, end) as body:
+                    try:
+                        names = _accumulate(body, stats, excluded, chunksize, sketches=sketches)
+                    except pd.errors.EmptyDataError:  # only blank lines so far
+                        pass
+                if names is None:
+                    # no chunk came back (a header alone on some pandas
+                    # versions); later tails still need the column names
+                    names = _read_header(f, end)
+
+        if not unchanged:
+            head_len = min(end, HEAD_BYTES)
+            _save_cache(cache_path, {
+                'version': _CACHE_VERSION,
+                'path': os.path.abspath(file_path),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'head': _head_checksum(f, head_len),
+                'head_len': head_len,
+                'offset': end,
+                'names': names,
+                'sketches': sketches,
+                'excluded': sorted(excluded),
+                'columns': {col: s.to_state() for col, s in stats.items()},
+            })
+
+        if end < st.st_size:
+            # fold in the unterminated last line without committing it
+            stats, excluded = copy.deepcopy(stats), set(excluded)
+            with _byte_range(f, end, st.st_size) as rest:
+                _accumulate(rest, stats, excluded, chunksize, names, sketches)
+    return stats
+
+
+def numeric_columns(file_path, cache=False, cache_dir=None) -> Dict[str, 'pd.Series']:
+    """
+    Return the numeric columns of a CSV file, optionally from a binary cache.
+
+    Without `cache` this is read_numeric() split into columns. With it, the
+    columns are also saved as .npy files in `cache_dir` (default
+    "<file>.npycache") with a manifest recording the source's size and
+    mtime. Later calls memory-map those files instead of parsing the text,
+    so only the pages actually touched are read. Any change to the
+    source's size or mtime rebuilds the cache.
+
+    Args:
+        file_path (str): Path to the CSV file
+        cache (bool): Use and maintain the .npy cache
+        cache_dir (str, optional): Directory for the cache files
+
+    Returns:
+        dict: {column: Series} for each numeric column, in file order
+    """
+    _pandas()
+    if not cache:
+        df = read_numeric(file_path)
+        return {col: df[col] for col in df.columns}
+
+    cache_dir = cache_dir or file_path + '.npycache'
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    st = os.stat(file_path)
+    manifest = _load_cache(manifest_path, _COLUMN_CACHE_VERSION)
+    if (
+        manifest is not None
+        and manifest['size'] == st.st_size
+        and manifest['mtime_ns'] == st.st_mtime_ns
+    ):
+        try:
+            return {
+                entry['name']: pd.Series(
+                    np.load(os.path.join(cache_dir, entry['file']), mmap_mode='r'),
+                    name=entry['name'], copy=False,
+                )
+                for entry in manifest['columns']
+            }
+        except (OSError, ValueError):  # a column file went missing or is damaged
+            pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if manifest is not None:
+        # invalidate before overwriting so a crash never leaves a stale match
+        os.remove(manifest_path)
+        for entry in manifest['columns']:
+            try:
+                os.remove(os.path.join(cache_dir, entry['file']))
+            except OSError:
+                pass
+    df = read_numeric(file_path)
+    entries = []
+    for i, col in enumerate(df.columns):
+        name = f'col_{i}.npy'
+        np.save(os.path.join(cache_dir, name), df[col].to_numpy())
+        entries.append({'name': col, 'file': name})
+    # the stat taken before parsing: a write during the parse forces a rebuild
+    _save_cache(manifest_path, {
+        'version': _COLUMN_CACHE_VERSION,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'columns': entries,
+    })
+    return {col: df[col] for col in df.columns}
+
+
+def _parse_number(field):
+    """Parse a field the way pd.read_csv's numeric inference would.
+
+    Returns an int or float, or None for a missing value. Raises ValueError
+    for anything pandas would leave as text, including forms Python accepts
+    but pandas does not (digit separators like "1_000") and integers
+    outside the int64/uint64 range. A column mixing negative integers with
+    integers >= 2**63 is rejected per column by _python_scan.
+    """
+    if field in _NA_VALUES:
+        return None
+    if '_' in field:
+        raise ValueError(field)
+    try:
+        value = int(field)
+    except ValueError:
+        return float(field)
+    if not _INT64_MIN <= value < _UINT64_END:
+        raise ValueError(field)
+    return value
+
+
+def _header_names(row):
+    """Column names as pandas builds them: blanks and duplicates renamed."""
+    names = []
+    seen = {}
+    for i, name in enumerate(row):
+        if name == '':
+            name = f'Unnamed: {i}'
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f'{base}.{seen[base]}'
+        seen[name] = 0
+        names.append(name)
+    return names
+
+
+class _GroupTable:
+    """Per-group {column: ColumnStats} with at most max_groups in memory.
+
+    When a new group would exceed the cap, every group in memory is
+    appended to one of _SPILL_PARTITIONS temporary files (chosen by the
+    hash of its key) and memory is cleared. items() then merges one
+    partition at a time, so only about 1/_SPILL_PARTITIONS of all groups
+    are held at once.
+    """
+
+    def __init__(self, max_groups=None, sketches=False):
+        max_groups = DEFAULT_MAX_GROUPS if max_groups is None else max_groups
+        if max_groups < 1:
+            raise ValueError("max_groups must be at least 1")
+        self.max_groups = max_groups
+        self.sketches = sketches
+        self.groups: Dict[tuple, Dict[str, ColumnStats]] = {}
+        self.excluded = set()
+        self.spills = 0
+        self._dir = None
+
+    def group(self, key):
+        """Return the {column: ColumnStats} map of group `key`, creating it."""
+        group = self.groups.get(key)
+        if group is None:
+            if len(self.groups) >= self.max_groups:
+                self._spill()
+            group = self.groups[key] = {}
+        return group
+
+    def column(self, key, col):
+        """Return the accumulator for `col` in group `key`, creating it."""
+        group = self.group(key)
+        stats = group.get(col)
+        if stats is None:
+            stats = group[col] = ColumnStats(self.sketches)
+        return stats
+
+    def drop_column(self, col):
+        """Forget `col` in every group, including groups already spilled."""
+        self.excluded.add(col)
+        for group in self.groups.values():
+            group.pop(col, None)
+
+    def _spill(self):
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix='analyze_csv_groups_')
+        files = [
+            open(os.path.join(self._dir, f'{i}.jsonl'), 'a', encoding='utf-8')
+            for i in range(_SPILL_PARTITIONS)
+        ]
+        try:
+            for key, group in self.groups.items():
+                record = [list(key), {col: s.to_state() for col, s in group.items()}]
+                files[hash(key) % _SPILL_PARTITIONS].write(json.dumps(record) + '\n')
+        finally:
+            for f in files:
+                f.close()
+        self.groups.clear()
+        self.spills += 1
+
+    def items(self):
+        """Yield (key, {column: ColumnStats}) once per group.
+
+        Groups come in first-seen order unless something was spilled, in
+        which case they come partition by partition.
+        """
+        if self._dir is None:
+            yield from self.groups.items()
+            return
+        try:
+            self._spill()
+            for i in range(_SPILL_PARTITIONS):
+                merged: Dict[tuple, Dict[str, ColumnStats]] = {}
+                with open(os.path.join(self._dir, f'{i}.jsonl'), encoding='utf-8') as f:
+                    for line in f:
+                        key, states = json.loads(line)
+                        group = merged.setdefault(tuple(key), {})
+                        for col, state in states.items():
+                            if col in self.excluded:
+                                continue
+                            stats = ColumnStats.from_state(state)
+                            if col in group:
+                                group[col].merge(stats)
+                            else:
+                                group[col] = stats
+                yield from merged.items()
+        finally:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+def _group_indexes(names, group_by):
+    missing = [col for col in group_by if col not in names]
+    if missing:
+        raise ValueError(f"group_by columns not in file: {missing}")
+    return [names.index(col) for col in group_by]
+
+
+def _python_scan(file_path, table, group_by=()):
+    """Fold every row of file_path into `table` using only the stdlib.
+
+    Returns the numeric columns in file order and the set of those that
+    pandas would read as float. As with pd.read_csv, when the first row
+    has one field more than the header, the first field of every row is
+    an unnamed index and is not analysed.
+    """
+    with _open_text(file_path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError("No columns to parse from file")
+        names = _header_names(header)
+        keys = _group_indexes(names, group_by)
+        numeric = [i not in keys for i in range(len(names))]
+        floats = [False] * len(names)
+        # pandas reads a column of only integers as int64 or uint64; one
+        # with both negative values and values >= 2**63 stays text
+        reals = [False] * len(names)
+        negative = [False] * len(names)
+        huge = [False] * len(names)
+        index = None  # 1 when rows start with an implicit index field
+        rows = 0
+        for row in reader:
+            if not row:
+                continue  # pandas skips blank lines
+            if index is None:
+                index = 1 if len(row) == len(names) + 1 else 0
+            if len(row) > len(names) + index:
+                raise ValueError(
+                    f"Expected {len(names) + index} fields in line {reader.line_num}, saw {len(row)}"
+                )
+            if index:
+                del row[0]
+            rows += 1
+            if len(row) < len(names):
+                for i in range(len(row), len(names)):
+                    floats[i] = True  # short rows are padded with NaN
+                row += [''] * (len(names) - len(row))
+            key = tuple(row[i] for i in keys)
+            # like groupby(dropna=True), rows with a missing key are not
+            # aggregated, but still count towards each column's type
+            group = None if any(k in _NA_VALUES for k in key) else table.group(key)
+            for i, field in enumerate(row):
+                if not numeric[i]:
+                    continue
+                try:
+                    value = _parse_number(field)
+                except ValueError:
+                    numeric[i] = False
+                    table.drop_column(names[i])
+                    continue
+                if value is None:
+                    floats[i] = True
+                    continue
+                if value.__class__ is float:
+                    floats[i] = reals[i] = True
+                elif value >= _INT64_END:
+                    huge[i] = True
+                elif value <= 0 and '-' in field:  # "-0" counts as signed
+                    negative[i] = True
+                if group is not None:
+                    stats = group.get(names[i])
+                    if stats is None:
+                        stats = group[names[i]] = ColumnStats(table.sketches)
+                    stats.add(value)
+
+    if not rows:
+        return [], set()  # header only: pandas reads the columns as object
+    for i, name in enumerate(names):
+        if numeric[i] and negative[i] and huge[i] and not reals[i]:
+            numeric[i] = False
+            table.drop_column(name)
+    columns = [name for name, keep in zip(names, numeric) if keep]
+    return columns, {name for name, is_float in zip(names, floats) if is_float}
+
+
+def _pandas_group_scan(file_path, table, group_by, chunksize):
+    """Fold every chunk of file_path into `table`; return the numeric columns.
+
+    Group columns are read as str, so keys look the same as with the
+    Python engine and merge across chunks whatever pandas would infer.
+    Without sketches each chunk is aggregated with groupby().agg() and
+    merged into a running per-group frame with vectorised pandas calls;
+    rows become ColumnStats only when that frame reaches the table's
+    max_groups, and at the end.
+    """
+    _pandas()
+    excluded = set()
+    columns = None
+    moments = None
+    with _open_source(file_path) as source:
+        reader = pd.read_csv(
+            source,
+            chunksize=chunksize or DEFAULT_CHUNKSIZE,
+            dtype={col: str for col in group_by},
+        )
+        for chunk in reader:
+            if columns is None:
+                _group_indexes(list(chunk.columns), group_by)
+                columns = [col for col in chunk.columns if col not in group_by]
+            if len(chunk) == 0:
+                continue  # every column is object in an empty chunk
+            numeric = set(chunk.select_dtypes(include=[np.number]).columns)
+            for col in columns:
+                if col not in excluded and col not in numeric:
+                    excluded.add(col)
+                    table.drop_column(col)
+            kept = [col for col in columns if col not in excluded]
+            if table.sketches:
+                for key, rows in chunk.groupby(list(group_by), sort=False, dropna=True):
+                    key = key if isinstance(key, tuple) else (key,)
+                    for col in kept:
+                        table.column(key, col).update(rows[col])
+                continue
+            moments = _merge_group_moments(moments, _group_moments(chunk, group_by, kept), kept)
+            if len(moments) >= table.max_groups:
+                _flush_group_moments(moments, table)
+                moments = None
+    if moments is not None:
+        _flush_group_moments(moments, table)
+    return [col for col in columns or () if col not in excluded]
+
+
+def _group_moments(chunk, group_by, kept):
+    """Per-group count, sum, min, max and M2 of the `kept` columns.
+
+    Returns a DataFrame indexed by group key with (statistic, column)
+    columns. Count, sum and M2 are taken in float64, as ColumnStats.update
+    does; min and max keep the column's dtype.
+    """
+    keys = [chunk[col] for col in group_by]
+    values = chunk[kept]
+    floats = values.astype('float64').groupby(keys, sort=False, dropna=True)
+    extremes = values.groupby(keys, sort=False, dropna=True)
+    count = floats.count()
+    return pd.concat({
+        'count': count,
+        'sum': floats.sum(),
+        'min': extremes.min(),
+        'max': extremes.max(),
+        'm2': floats.var(ddof=1).mul(count - 1).fillna(0.0),  # var is NaN below 2
+    }, axis=1)
+
+
+def _merge_group_moments(moments, part, kept):
+    """Combine two frames from _group_moments with Chan's formula.
+
+    Groups keep their first-seen order; columns not in `kept` are dropped.
+    """
+    if moments is None:
+        return part
+    both = pd.concat([moments, part])
+    levels = list(range(both.index.nlevels))
+
+    def combine(stat, how):
+        return both[stat][kept].groupby(level=levels, sort=False).agg(how)
+
+    count = combine('count', 'sum')
+    total = combine('sum', 'sum')
+    # M2 = sum of the parts' M2 plus each part's count * (its mean - mean)^2
+    spread = both['sum'][kept] / both['count'][kept] - (total / count).reindex(both.index)
+    m2 = (both['m2'][kept] + both['count'][kept] * spread ** 2).fillna(0.0)
+    return pd.concat({
+        'count': count,
+        'sum': total,
+        'min': combine('min', 'min'),
+        'max': combine('max', 'max'),
+        'm2': m2.groupby(level=levels, sort=False).sum(),
+    }, axis=1)
+
+
+def _flush_group_moments(moments, table):
+    """Merge each row of a _group_moments frame into `table`."""
+    index = moments.index.tolist()
+    if moments.index.nlevels == 1:
+        index = [(key,) for key in index]
+    per_column = [
+        (col, moments[('count', col)].tolist(), moments[('sum', col)].tolist(),
+         moments[('min', col)].tolist(), moments[('max', col)].tolist(),
+         moments[('m2', col)].tolist())
+        for col in moments['count'].columns
+    ]
+    for i, key in enumerate(index):
+        # one lookup per group: table.group() may spill and clear the table
+        group = table.group(key)
+        for col, counts, totals, mins, maxs, m2s in per_column:
+            count = int(counts[i])
+            if not count:
+                continue
+            part = ColumnStats()
+            part.count, part.total = count, totals[i]
+            part.min, part.max = mins[i], maxs[i]
+            part.mean, part.m2 = totals[i] / count, m2s[i]
+            stats = group.get(col)
+            if stats is None:
+                group[col] = part
+            else:
+                stats._merge_moments(part)
+
+
+def _finish_group(group, columns, float_columns, sketches):
+    """Order a group's accumulators by column, filling in empty ones."""
+    result = {}
+    for col in columns:
+        stats = group.get(col) or ColumnStats(sketches)
+        if col in float_columns and stats.count:
+            stats.min, stats.max = float(stats.min), float(stats.max)
+        result[col] = stats
+    return result
+
+
+def python_stats(file_path, sketches=False) -> Dict[str, ColumnStats]:
+    """
+    Accumulate statistics per numeric column using only the standard library.
+
+    One pass with csv.reader; each field is parsed with _parse_number and
+    folded into a ColumnStats. A column counts as numeric when every field
+    parses (missing values included), which is what
+    select_dtypes(include=[np.number]) keeps after pd.read_csv: True/False
+    columns are bool, not numeric, and a column of only missing values is
+    float. As with pandas, a column that holds any float or missing value
+    reports float min/max.
+
+    Args:
+        file_path (str): Path to the CSV file
+        sketches (bool): Also keep quantile and distinct-count sketches
+
+    Returns:
+        dict: {column: ColumnStats} for each numeric column, in file order
+    """
+    table = _GroupTable(sketches=sketches)
+    columns, float_columns = _python_scan(file_path, table)
+    group = dict(table.items()).get((), {})
+    return _finish_group(group, columns, float_columns, sketches)
+
+
+def group_stats(
+    file_path,
+    group_by,
+    chunksize: Optional[int] = None,
+    sketches: bool = False,
+    max_groups: Optional[int] = None,
+    engine: str = 'auto',
+):
+    """
+    Accumulate statistics per group and numeric column in one pass.
+
+    Each row is folded into a hash map from the group key (the tuple of
+    `group_by` values, as strings) to per-column ColumnStats. Rows whose
+    key has a missing value are skipped, as groupby(dropna=True) does.
+    When more than `max_groups` groups are in memory they are spilled to
+    temporary hash-partitioned files and merged back partition by
+    partition at the end, so memory is bounded by `max_groups` rather
+    than by the number of distinct keys.
+
+    Args:
+        file_path (str): Path to the CSV file
+        group_by (list of str): Columns forming the group key
+        chunksize (int, optional): Rows per chunk for the pandas engine
+        sketches (bool): Also keep quantile and distinct-count sketches
+        max_groups (int, optional): Groups held in memory before spilling
+            (default DEFAULT_MAX_GROUPS)
+        engine (str): 'auto', 'python' or 'pandas', as in analyze_csv
+
+    Yields:
+        tuple: (key, {column: ColumnStats}) for each group
+    """
+    group_by = list(group_by)
+    table = _GroupTable(max_groups, sketches)
+    if _choose_engine(file_path, engine) == 'python':
+        columns, float_columns = _python_scan(file_path, table, group_by)
+    else:
+        columns, float_columns = _pandas_group_scan(file_path, table, group_by, chunksize), set()
+    for key, group in table.items():
+        yield key, _finish_group(group, columns, float_columns, sketches)
+
+
+def _choose_engine(file_path, engine):
+    if engine == 'auto':
+        if 'pandas' in sys.modules:
+            return 'pandas'  # the import is already paid for
+        size = os.path.getsize(file_path)
+        if _compression(file_path) is not None:
+            size *= _COMPRESSION_RATIO
+        return 'python' if size < PYTHON_ENGINE_MAX_BYTES else 'pandas'
+    if engine not in ('python', 'pandas'):
+        raise ValueError("engine must be 'auto', 'python' or 'pandas'")
+    return engine
+
+
+def analyze_csv(
+    file_path,
+    chunksize=None,
+    incremental=False,
+    quantiles=None,
+    cache=False,
+    engine='auto',
+    group_by=None,
+    max_groups=None,
+):
+    """
+    Read a CSV file and calculate mean, min, and max for all numeric columns.
+
+    gzip, bz2, xz and zstd files (zstd needs the zstandard package) are
+    decompressed on the fly in a background thread, in every mode.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int, optional): Stream the file this many rows at a time
+            instead of loading it whole, so memory stays bounded for files
+            larger than RAM (see stream_stats)
+        incremental (bool): For append-only files, keep the statistics in a
+            "<file>.stats.json" sidecar and parse only rows appended since
+            the previous call (see incremental_stats)
+        quantiles (list of float, optional): Also report approximate
+            quantiles, e.g. [0.5, 0.9, 0.99], and an approximate distinct
+            count per column from mergeable sketches (streams the file)
+        cache (bool): Keep the parsed numeric columns as .npy files in
+            "<file>.npycache" and memory-map them on later runs; rebuilt
+            when the file's size or mtime changes
+        engine (str): 'pandas', 'python' (standard library only, see
+            python_stats) or 'auto', which picks python for files under
+            PYTHON_ENGINE_MAX_BYTES unless pandas is already imported;
+            chunksize, incremental and cache always use pandas
+        group_by (list of str, optional): Aggregate per distinct value of
+            these columns in one streaming pass (see group_stats); the
+            result is then keyed by group, each a tuple of strings
+        max_groups (int, optional): With group_by, groups kept in memory
+            before spilling to disk
+        
+    Returns:
+        dict: Dictionary containing statistics for each numeric column,
+        or {group key: statistics} with group_by
+    """
+    sketches = quantiles is not None
+    quantiles = tuple(quantiles or ())
+    if group_by:
+        if incremental or cache:
+            raise ValueError("group_by cannot be combined with incremental or cache")
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        groups = group_stats(file_path, group_by, chunksize, sketches, max_groups, engine)
+        return {
+            key: {col: s.summary(quantiles) for col, s in stats.items()}
+            for key, stats in groups
+        }
+    if incremental:
+        stats = incremental_stats(file_path, chunksize, sketches=sketches)
+        return {col: s.summary(quantiles) for col, s in stats.items()}
+    if chunksize is None and not cache and _choose_engine(file_path, engine) == 'python':
+        stats = python_stats(file_path, sketches)
+        return {col: s.summary(quantiles) for col, s in stats.items()}
+    if chunksize is not None or sketches:
+        stats = stream_stats(file_path, chunksize, sketches)
+        return {col: s.summary(quantiles) for col, s in stats.items()}
+
+    # Read only the numeric columns (found by sniffing the first rows)
+    columns = numeric_columns(file_path, cache=cache)
+    
+    # Calculate statistics for each numeric column
+    stats = {}
+    for col, values in columns.items():
+        stats[col] = {
+            'mean': values.mean(),
+            'min': values.min(),
+            'max': values.max()
+        }
+    
+    return stats
+
+
+def _analyze_file(task):
+    """Worker: return (path, {column: ColumnStats}, error message or None)."""
+    path, chunksize, sketches = task
+    try:
+        return path, stream_stats(path, chunksize, sketches), None
+    except Exception as exc:  # one bad shard must not stop the run
+        return path, None, f"{type(exc).__name__}: {exc}"
+
+
+def analyze_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    quantiles: Optional[Iterable[float]] = None,
+):
+    """
+    Analyze many CSV files in a process pool and merge their statistics.
+
+    Each file is streamed by stream_stats in a worker process and only the
+    small per-column accumulators travel back. They are merged in the order
+    of `paths`, so the global result does not depend on which worker
+    finished first. A file that fails to read is reported in 'errors' and
+    left out of the global statistics; the other files are unaffected.
+
+    Args:
+        paths (iterable of str): CSV files to analyze; a path listed more
+            than once is analyzed and counted once
+        workers (int, optional): Worker processes (default: CPU count);
+            1 runs everything in this process
+        chunksize (int): Rows per chunk within each file
+        progress (callable, optional): Called as progress(done, total, path)
+            each time a file finishes, successfully or not
+        quantiles (iterable of float, optional): Also report approximate
+            quantiles and distinct counts, per file and merged globally
+
+    Returns:
+        dict: {'files': {path: stats}, 'global': stats, 'errors': {path: message}},
+        where each stats is {column: {'mean', 'min', 'max'}} as in analyze_csv
+    """
+    paths = list(dict.fromkeys(paths))  # results are keyed by path
+    sketches = quantiles is not None
+    quantiles = tuple(quantiles or ())
+    results = {}
+    tasks = [(path, chunksize, sketches) for path in paths]
+    if workers == 1 or len(paths) <= 1:
+        for done, task in enumerate(tasks, 1):
+            results[task[0]] = _analyze_file(task)
+            if progress is not None:
+                progress(done, len(tasks), task[0])
+    else:
+        # imported here: concurrent.futures.process pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_analyze_file, task): task[0] for task in tasks}
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except Exception as exc:  # e.g. a worker process died
+                    results[path] = path, None, f"{type(exc).__name__}: {exc}"
+                if progress is not None:
+                    progress(done, len(tasks), path)
+
+    files, errors = {}, {}
+    overall: Dict[str, ColumnStats] = {}
+    for path in paths:
+        _, stats, error = results[path]
+        if error is not None:
+            errors[path] = error
+            continue
+        files[path] = {col: s.summary(quantiles) for col, s in stats.items()}
+        for col, s in stats.items():
+            if col not in overall:
+                overall[col] = ColumnStats(sketches)
+            overall[col].merge(s)
+    return {
+        'files': files,
+        'global': {col: s.summary(quantiles) for col, s in overall.items()},
+        'errors': errors,
+    }
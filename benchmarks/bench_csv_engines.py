@@ -0,0 +1,76 @@
+"""Find the file size where analyze_csv's pandas engine overtakes the
+pure-Python one.
+
+Run from the repository root:
+
+    python benchmarks/bench_csv_engines.py [max_mib]
+
+For files from 16 KiB up to `max_mib` MiB (4 numeric and 2 text columns)
+it times:
+- python: engine='python' in a fresh interpreter (no pandas import)
+- pandas cold: engine='pandas' in a fresh interpreter, import included,
+  which is what a short-lived worker pays
+- pandas warm: engine='pandas' with pandas already imported, which is
+  what engine='auto' picks whenever pandas is loaded
+Every run starts a new process so the cold numbers include start-up.
+PYTHON_ENGINE_MAX_BYTES in csv_analytics.py should sit near the point
+where "python" stops beating "pandas cold".
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ANALYTICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Assinment2")
+
+_RUN = """
+import sys, time
+start = time.perf_counter()
+import csv_analytics
+if {warm}:
+    csv_analytics._pandas()
+    start = time.perf_counter()
+csv_analytics.analyze_csv(sys.argv[1], engine={engine!r})
+print(time.perf_counter() - start)
+"""
+
+
+def _write_sample(path: str, size: int) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("temperature,humidity,pressure,count,station,note\n")
+        while f.tell() < size:
+            f.write(
+                f"{rng.uniform(-10, 40):.2f},{rng.uniform(0, 100):.1f},"
+                f"{rng.gauss(1013, 8):.3f},{rng.randrange(1000)},"
+                f"st{rng.randrange(50)},{''.join(rng.choices('abcdef', k=8))}\n"
+            )
+
+
+def _run(path: str, engine: str, warm: bool) -> float:
+    env = dict(os.environ, PYTHONPATH=ANALYTICS_DIR)
+    code = _RUN.format(engine=engine, warm=warm)
+    proc = subprocess.run([sys.executable, "-c", code, path], env=env, capture_output=True, text=True)
+    return float(proc.stdout) if proc.returncode == 0 else float("nan")  # pandas missing
+
+
+def main() -> None:
+    max_mib = float(sys.argv[1]) if len(sys.argv) > 1 else 32
+    size = 16 << 10
+    print(f"{'size':>10} {'python':>9} {'pandas cold':>12} {'pandas warm':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        while size <= max_mib * 2**20:
+            path = os.path.join(tmp, f"{size}.csv")
+            _write_sample(path, size)
+            py = min(_run(path, "python", False) for _ in range(3))
+            cold = min(_run(path, "pandas", False) for _ in range(3))
+            warm = min(_run(path, "pandas", True) for _ in range(3))
+            cells = [f"{t:8.3f}s" if t == t else f"{'n/a':>9}" for t in (py, cold, warm)]
+            print(f"{size / 2**20:9.3f}M {cells[0]} {cells[1]:>12} {cells[2]:>12}")
+            size *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark analyze_csv's column-pruned read against a full pd.read_csv.
+
+Run from the repository root (needs pandas; pyarrow is used if installed):
+
+    python benchmarks/bench_csv_parse.py [rows] [text_columns]
+
+Writes a temporary CSV with 4 numeric columns and `text_columns` text
+columns, then times the old path (read everything, then select_dtypes)
+against csv_analytics.read_numeric (sniff, then usecols/dtype).
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Assinment2"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from csv_analytics import read_numeric  # noqa: E402
+
+
+def _write_sample(path: str, rows: int, text_columns: int) -> None:
+    rng = random.Random(0)
+    header = ["temperature", "humidity", "pressure", "count"]
+    header += [f"text_{i}" for i in range(text_columns)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(header) + "\n")
+        for _ in range(rows):
+            fields = [
+                f"{rng.uniform(-10, 40):.2f}", f"{rng.uniform(0, 100):.1f}",
+                f"{rng.gauss(1013, 8):.3f}", str(rng.randrange(1000)),
+            ]
+            fields += ["".join(rng.choices("abcdefghij", k=12)) for _ in range(text_columns)]
+            f.write(",".join(fields) + "\n")
+
+
+def _full_read(path: str):
+    df = pd.read_csv(path)
+    return df.select_dtypes(include=[np.number])
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    text_columns = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wide.csv")
+        _write_sample(path, rows, text_columns)
+        size = os.path.getsize(path) / 2**20
+        print(f"rows={rows} text_columns={text_columns} size={size:.1f} MiB")
+        full = min(_timed(_full_read, path) for _ in range(3))
+        pruned = min(_timed(read_numeric, path) for _ in range(3))
+        print(f"read_csv + select_dtypes {full:8.3f}s")
+        print(f"read_numeric             {pruned:8.3f}s  speed-up x{full / pruned:.2f}")
+
+
+if __name__ == "__main__":
+    main()
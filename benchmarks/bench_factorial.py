@@ -0,0 +1,54 @@
+"""Benchmark the factorial engine: linear loop, product tree, process pool.
+
+Run from the repository root:
+
+    python benchmarks/bench_factorial.py                 # n = 10**4 .. 10**6
+    python benchmarks/bench_factorial.py 3000000 10000000
+
+For each n it prints the serial product-tree time and the time and
+speed-up with 2, 4, ... workers (up to os.cpu_count()). The term-by-term
+loop is only timed while it finishes in reasonable time.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from factorials import factorial  # noqa: E402
+
+_LINEAR_MAX_N = 100_000
+
+
+def _linear(n: int) -> int:
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    cpus = os.cpu_count() or 1
+    pools = [w for w in (2, 4, 8, 16, 32) if w <= cpus] or [2]
+    print(f"cpu_count={cpus}")
+    for n in sizes:
+        serial = _timed(factorial, n)
+        line = f"n={n:>9}  tree {serial:8.3f}s"
+        if n <= _LINEAR_MAX_N:
+            line += f"  linear {_timed(_linear, n):8.3f}s"
+        print(line)
+        for workers in pools:
+            elapsed = _timed(factorial, n, workers=workers)
+            print(f"    workers={workers:<3} {elapsed:8.3f}s  speed-up x{serial / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
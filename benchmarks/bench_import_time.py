@@ -0,0 +1,60 @@
+"""Measure the start-up cost of importing the CSV analytics module.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py [repeats]
+
+Each measurement runs a fresh `python -X importtime` and reads the
+cumulative time of the top-level import from its report. It compares
+importing csv_analytics (and the Task1 script) with what the first
+analysis pays once pandas is loaded, and checks that importing writes no
+files.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ANALYTICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Assinment2")
+
+CASES = {
+    "import csv_analytics": "import csv_analytics",
+    "import Task1": "import Task1",
+    "csv_analytics + pandas": "import csv_analytics; csv_analytics._pandas()",
+}
+
+
+def _import_us(code: str, module: str, cwd: str) -> int:
+    """Cumulative microseconds for `module` as reported by -X importtime."""
+    env = dict(os.environ, PYTHONPATH=ANALYTICS_DIR)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        return -1  # e.g. pandas not installed
+    total = 0
+    for line in proc.stderr.splitlines():
+        # "import time:      self [us] |   cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() in (module, "pandas"):
+            total += int(parts[1])
+    return total
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as cwd:
+        print(f"{'case':>24} {'best ms':>9}")
+        for name, code in CASES.items():
+            module = code.split(";")[0].split()[-1]
+            _import_us(code, module, cwd)  # warm the bytecode cache
+            best = min(_import_us(code, module, cwd) for _ in range(repeats))
+            print(f"{name:>24} {best / 1000:9.1f}" if best >= 0 else f"{name:>24} {'failed':>9}")
+        leftovers = os.listdir(cwd)
+        print("files written on import:", leftovers or "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark primes.prime_pi against counting with task2.is_prime.
+
+Run from the repository root:
+
+    python benchmarks/bench_prime_pi.py            # up to 10**11
+    python benchmarks/bench_prime_pi.py 12         # include 10**12
+
+The naive loop is only timed up to 10**6; above that it is extrapolated
+linearly from the last measurement, which understates it.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import primes  # noqa: E402
+from task2 import is_prime  # noqa: E402
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def naive_pi(x: int) -> int:
+    return sum(1 for n in range(x + 1) if is_prime(n))
+
+
+def main() -> None:
+    max_exp = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+    print(f"{'x':>8} {'pi(x)':>16} {'prime_pi':>11} {'naive loop':>14}")
+    naive_rate = None
+    for e in range(3, max_exp + 1):
+        x = 10**e
+        primes._counter = None  # time a cold start, including the sieve
+        count, fast = _timed(primes.prime_pi, x)
+        if e <= 6:
+            expected, slow = _timed(naive_pi, x)
+            assert expected == count, (x, expected, count)
+            naive_rate = slow / x
+            naive = f"{slow:12.3f}s"
+        else:
+            naive = f"~{naive_rate * x:11.0f}s"
+        print(f"{'10^%d' % e:>8} {count:>16} {fast:10.3f}s {naive:>14}")
+
+
+if __name__ == "__main__":
+    main()
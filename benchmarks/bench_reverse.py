@@ -0,0 +1,57 @@
+"""Benchmark task3.reverse_many on a mixed workload.
+
+Run from the repository root:
+
+    python benchmarks/bench_reverse.py [count]
+
+Each row times one kind of input, and the last row times a shuffled mix
+of all of them. It compares codepoint mode, grapheme mode (fast paths
+plus segmentation) and segmenting every string unconditionally.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task3 import _graphemes, reverse_many  # noqa: E402
+
+SAMPLES = {
+    "ascii": "The quick brown fox jumps over the lazy dog 0123456789",
+    "latin-1": "Ça va très bien, señor Müller; übermäßig groß",
+    "cjk": "東京は日本の首都であり、世界最大の都市圏の一つです",
+    "combining": "Café näive résumé à la carte",
+    "emoji-zwj": "family 👨‍👩‍👧‍👦 and 👍🏽 flags 🇫🇷🇩🇪",
+}
+
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _segment_all(strings):
+    return ["".join(reversed(_graphemes(s))) for s in strings]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reverse_many(["x́"], mode="grapheme")  # build the lazy tables first
+    workloads = {name: [text] * count for name, text in SAMPLES.items()}
+    mix = [text for texts in workloads.values() for text in texts[: count // len(SAMPLES)]]
+    random.shuffle(mix)
+    workloads["mix"] = mix
+
+    print(f"{'input':>10} {'codepoint':>10} {'grapheme':>10} {'segment all':>12}")
+    for name, strings in workloads.items():
+        cp = _timed(reverse_many, strings, mode="codepoint")
+        gr = _timed(reverse_many, strings, mode="grapheme")
+        seg = _timed(_segment_all, strings)
+        print(f"{name:>10} {cp:9.3f}s {gr:9.3f}s {seg:11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
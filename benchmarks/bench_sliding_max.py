@@ -0,0 +1,61 @@
+"""Benchmark task5.sliding_max against calling find_max once per window.
+
+Run from the repository root:
+
+    python benchmarks/bench_sliding_max.py [n]
+
+For each window size from 10 to 10**5 it times the deque generator over a
+stream of n floats, the NumPy block variant when NumPy is installed, and
+the naive approach (find_max_iterative on every window slice). The naive
+time is measured on the first few hundred windows and extrapolated to all
+of them, since the full run is O(n * window).
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task5 import find_max_iterative, np, sliding_max, sliding_max_array  # noqa: E402
+
+_NAIVE_WINDOWS = 200
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _deque(data, window):
+    for _ in sliding_max(iter(data), window):
+        pass
+
+
+def _naive(data, window, count):
+    for i in range(count):
+        find_max_iterative(data[i:i + window])
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data = [random.random() for _ in range(n)]
+    array = np.asarray(data) if np is not None else None
+
+    print(f"n={n}")
+    print(f"{'window':>8} {'deque':>9} {'numpy':>9} {'naive (est.)':>13}")
+    for window in (10, 100, 1_000, 10_000, 100_000):
+        if window > n:
+            break
+        windows = n - window + 1
+        dq = _timed(_deque, data, window)
+        vec = f"{_timed(sliding_max_array, array, window):8.3f}s" if array is not None else f"{'-':>9}"
+        sample = min(windows, _NAIVE_WINDOWS)
+        naive = _timed(_naive, data, window, sample) * windows / sample
+        print(f"{window:>8} {dq:8.3f}s {vec} {naive:12.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Shared big-factorial engine used by task2.py, task3.py and task4.py.
+
+Multiplying 1 * 2 * ... * n one term at a time keeps multiplying a huge
+integer by a small one, which is quadratic overall. The functions here
+multiply balanced halves instead (a binary-splitting product tree), so the
+expensive multiplications are between numbers of similar size and Python's
+Karatsuba multiplication does the heavy work.
+
+`factorial` also splits n! into its odd part and a power of two, the same
+scheme CPython's math.factorial uses, so the factors of two are applied
+with a single shift. For very large n it can spread the leaf products and
+the lower merge levels across a process pool (`workers=`).
+
+Callers that only need the size of n!, its trailing zeros or n! mod m can
+use factorial_digits, factorial_trailing_zeros and factorial_mod, which
+never build the big integer. Callers that ask for many nearby n can share a
+FactorialCache.
+"""
+
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from math import floor, lgamma, log, prod
+from typing import Dict, List, Optional, Tuple
+
+from primes import factorize, is_prime_fast
+
+# Below this many terms a plain product is faster than splitting further.
+_LEAF_TERMS = 32
+
+# Below this n a process pool costs more (start-up plus pickling the
+# partial products) than it saves, so factorial() stays serial.
+PARALLEL_THRESHOLD = 100_000
+
+
+def range_product(lo: int, hi: int) -> int:
+    """Return the product of the integers in [lo, hi) using a product tree.
+
+    Examples:
+    >>> range_product(5, 8)
+    210
+    >>> range_product(3, 3)
+    1
+    """
+    if hi - lo <= _LEAF_TERMS:
+        return prod(range(lo, hi))
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid, hi)
+
+
+def _odd_product(lo: int, hi: int) -> int:
+    """Return the product of the odd integers in [lo, hi); lo must be odd."""
+    count = (hi - lo + 1) // 2
+    if count <= _LEAF_TERMS:
+        return prod(range(lo, hi, 2))
+    mid = lo + 2 * (count // 2)
+    return _odd_product(lo, mid) * _odd_product(mid, hi)
+
+
+def _chunk_product(bounds: Tuple[int, int]) -> int:
+    return range_product(*bounds)
+
+
+def _pair_product(pair: Tuple[int, int]) -> int:
+    return pair[0] * pair[1]
+
+
+def _parallel_factorial(n: int, workers: int, chunk_size: Optional[int]) -> int:
+    """Compute n! with leaf ranges and lower merge levels in a process pool."""
+    if chunk_size is None:
+        # a few chunks per worker keeps everyone busy while the chunks stay big
+        chunk_size = max(_LEAF_TERMS, -(-n // (4 * workers)))
+    bounds = [(lo, min(lo + chunk_size, n + 1)) for lo in range(2, n + 1, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts: List[int] = list(pool.map(_chunk_product, bounds))
+        # Merge neighbours pairwise, one tree level per round, while there
+        # is still enough work at a level to share out.
+        while len(parts) >= 4:
+            pairs = list(zip(parts[0::2], parts[1::2]))
+            merged = list(pool.map(_pair_product, pairs))
+            if len(parts) % 2:
+                merged.append(parts[-1])
+            parts = merged
+    # The last one or two products are the biggest; shipping them to a
+    # worker would cost as much as multiplying them here.
+    return prod(parts)
+
+
+def factorial(n: int, workers: Optional[int] = None, chunk_size: Optional[int] = None) -> int:
+    """Compute n! with a product tree over its odd part.
+
+    - Raises ValueError for negative inputs.
+    - With `workers` > 1 and n >= PARALLEL_THRESHOLD, range products of
+      `chunk_size` terms and the lower levels of the merge tree run in a
+      ProcessPoolExecutor; below the threshold it falls back to serial.
+      Call it under ``if __name__ == "__main__":`` on platforms that spawn
+      worker processes.
+    - The odd part of n! is the product over i >= 0 of the odd numbers in
+      (n / 2**(i+1), n / 2**i], each raised to the power i + 1; it is
+      built by accumulating those ranges from the top bit down. The power
+      of two is 2**(n - popcount(n)).
+
+    Examples:
+    >>> factorial(0)
+    1
+    >>> factorial(10)
+    3628800
+    """
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if workers is not None and workers > 1 and n >= PARALLEL_THRESHOLD:
+        return _parallel_factorial(n, workers, chunk_size)
+    inner = outer = 1
+    upper = 3
+    for i in range(n.bit_length() - 2, -1, -1):
+        v = n >> i
+        if v <= 2:
+            continue
+        lower = upper
+        upper = (v + 1) | 1  # least odd integer > n / 2**i
+        # inner: product of odd j <= n / 2**(i+1); extend it to n / 2**i
+        inner *= _odd_product(lower, upper)
+        outer *= inner
+    return outer << (n - bin(n).count("1"))
+
+
+# Below this n an uncertain lgamma estimate is settled by computing n!
+# exactly; above it the Stirling series is re-evaluated with Decimal.
+_EXACT_DIGITS_BELOW = 1000
+
+# lgamma overflows (and float(n) fails) long before this; larger n go
+# straight to the Decimal Stirling series.
+_LGAMMA_MAX = 2 ** 1000
+
+# pi to 60 digits for the high-precision Stirling fallback
+_PI = Decimal("3.14159265358979323846264338327950288419716939937510582097494")
+
+
+def _log10_factorial_decimal(n: int, digits: int) -> Decimal:
+    """log10(n!) from the Stirling series, to about `digits` digits.
+
+    For n >= 1000 the truncation error after the n**-7 term is below
+    1/(1188 n**9) < 1e-29.
+    """
+    with localcontext() as ctx:
+        ctx.prec = digits
+        d = Decimal(n)
+        ln_fact = (
+            d * d.ln() - d + (2 * _PI * d).ln() / 2
+            + 1 / (12 * d) - 1 / (360 * d ** 3)
+            + 1 / (1260 * d ** 5) - 1 / (1680 * d ** 7)
+        )
+        return ln_fact / Decimal(10).ln()
+
+
+def factorial_digits(n: int) -> int:
+    """Return the number of decimal digits of n! without computing n!.
+
+    - Raises ValueError for negative inputs.
+    - Uses lgamma for the estimate and re-evaluates the Stirling series with
+      Decimal when the float result is too close to an integer to trust.
+      O(1) time and memory for n below 2**1000. Beyond that n! has more
+      digits than a float can count, so the Decimal series is used
+      directly with enough precision for the integer part of log10(n!).
+
+    Examples:
+    >>> factorial_digits(10)
+    7
+    >>> factorial_digits(10**6)
+    5565709
+    """
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if n < 20:
+        return len(str(factorial(n)))
+    if n >= _LGAMMA_MAX:
+        # log10(n!) < n * log10(n) has about log10(n) + log10(log10(n)) digits
+        digits = n.bit_length() * 30103 // 100000 + 60
+        return int(_log10_factorial_decimal(n, digits)) + 1
+    x = lgamma(n + 1) / log(10)
+    k = floor(x)
+    # lgamma is accurate to a few ulps, so allow a margin relative to x
+    margin = 1e-12 * x
+    if margin < 1e-3 and margin < x - k < 1 - margin:
+        return k + 1
+    if n < _EXACT_DIGITS_BELOW:
+        return len(str(factorial(n)))
+    exact = _log10_factorial_decimal(n, len(str(k)) + 40)
+    return int(exact) + 1
+
+
+def factorial_trailing_zeros(n: int, base: int = 10) -> int:
+    """Return the number of trailing zeros of n! written in `base`.
+
+    - Raises ValueError for negative n or base < 2.
+    - Legendre's formula gives the exponent of each prime p of the base in
+      n! as n//p + n//p**2 + ...; the answer is the smallest exponent
+      divided by that prime's multiplicity in the base. O(log n) per prime.
+
+    Examples:
+    >>> factorial_trailing_zeros(100)
+    24
+    >>> factorial_trailing_zeros(10, base=2)
+    8
+    """
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if base < 2:
+        raise ValueError("base must be at least 2")
+    zeros = None
+    for p, e in factorize(base).items():
+        count = 0
+        q = n
+        while q:
+            q //= p
+            count += q
+        zeros = count // e if zeros is None else min(zeros, count // e)
+    return zeros
+
+
+def _mod_range_product(lo: int, hi: int, m: int) -> int:
+    """Return the product of [lo, hi) modulo m, 256 terms per reduction."""
+    result = 1 % m
+    for start in range(lo, hi, 256):
+        result = result * prod(range(start, min(start + 256, hi))) % m
+    return result
+
+
+def factorial_mod(n: int, m: int) -> int:
+    """Return n! mod m without building n!.
+
+    - Raises ValueError for negative n or m < 1.
+    - Returns 0 as soon as m divides n! (checked with Legendre's formula on
+      the factorization of m, which covers every n >= m).
+    - For prime m and n > m/2, Wilson's theorem (m-1)! = -1 (mod m) turns
+      the product into the shorter one over (n, m).
+    - Otherwise multiplies the terms modulo m in blocks, so time is
+      O(min(n, m - n)) and memory O(1).
+
+    Examples:
+    >>> factorial_mod(10, 7)
+    0
+    >>> factorial_mod(5, 1000)
+    120
+    >>> factorial_mod(10**6, 1000003)
+    500001
+    """
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if m < 1:
+        raise ValueError("modulus must be positive")
+    if m == 1 or n >= m:
+        return 0
+    for p, e in factorize(m).items():
+        count = 0
+        q = n
+        while q and count < e:
+            q //= p
+            count += q
+        if count < e:
+            break
+    else:
+        return 0  # every prime power of m divides n!
+
+    if 2 * n > m and is_prime_fast(m):
+        # n! * (n+1) * ... * (m-1) = (m-1)! = -1 (mod m)
+        return -pow(_mod_range_product(n + 1, m, m), -1, m) % m
+    return _mod_range_product(2, n + 1, m)
+
+
+class FactorialCache:
+    """Cache of factorial checkpoints with byte-bounded LRU eviction.
+
+    Every `step`-th factorial that gets computed is kept as a checkpoint. A
+    request for n! starts from the nearest checkpoint at or below n and
+    multiplies in only the missing range, so nearby requests are cheap.
+    Checkpoints are evicted least recently used first once their total size
+    exceeds `max_bytes`.
+
+    Examples:
+    >>> cache = FactorialCache(step=10)
+    >>> cache.get(12)
+    479001600
+    >>> cache.get(15) == 1307674368000
+    True
+    >>> cache.stats()["hits"], cache.stats()["misses"]
+    (1, 1)
+    """
+
+    def __init__(self, step: int = 1000, max_bytes: int = 64 * 2**20) -> None:
+        if step < 1:
+            raise ValueError("step must be at least 1")
+        self.step = step
+        self.max_bytes = max_bytes
+        self._checkpoints: "OrderedDict[int, int]" = OrderedDict()
+        self._sizes: Dict[int, int] = {}
+        self._keys: List[int] = []  # sorted checkpoint positions
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def _store(self, k: int, value: int) -> None:
+        size = (value.bit_length() + 7) // 8
+        if size > self.max_bytes:
+            return
+        self._checkpoints[k] = value
+        self._sizes[k] = size
+        insort(self._keys, k)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            old, _ = self._checkpoints.popitem(last=False)
+            self.bytes -= self._sizes.pop(old)
+            del self._keys[bisect_right(self._keys, old) - 1]
+            self.evictions += 1
+
+    def get(self, n: int) -> int:
+        """Return n!, extending from the nearest checkpoint below n.
+
+        Raises ValueError for negative inputs.
+        """
+        if n < 0:
+            raise ValueError("factorial is not defined for negative numbers")
+        top = n - n % self.step
+        i = bisect_right(self._keys, top)
+        if i:
+            self.hits += 1
+            base = self._keys[i - 1]
+            value = self._checkpoints[base]
+            self._checkpoints.move_to_end(base)
+            if base < top:
+                value *= range_product(base + 1, top + 1)
+                self._store(top, value)
+        else:
+            self.misses += 1
+            value = factorial(top)
+            if top:
+                self._store(top, value)
+        return value * range_product(top + 1, n + 1)
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, eviction count and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "checkpoints": len(self._checkpoints),
+            "bytes": self.bytes,
+        }
+
+    def clear(self) -> None:
+        """Drop every checkpoint; the counters are kept."""
+        self._checkpoints.clear()
+        self._sizes.clear()
+        self._keys.clear()
+        self.bytes = 0
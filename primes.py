@@ -0,0 +1,798 @@
+"""Prime-number engines shared by the primality helpers in task2.py.
+
+The scalar `task2.is_prime` uses 6k±1 trial division, which is fine for one
+number at a time but costs O(N·√N) over a batch of N values. This module
+provides a segmented Sieve of Eratosthenes that answers bulk queries with
+O(1) bit tests once the segment covering a value has been sieved.
+
+Segments store odd numbers only, one bit each, so a segment of S integers
+takes S/16 bytes. Only a bounded number of segments is kept (LRU), which
+keeps memory flat for ranges up to 10**10 and beyond.
+
+The same bit layout can be written to disk once with `build_prime_table`
+and memory-mapped read-only by worker processes through `PrimeTable`.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate, compress, repeat
+from math import gcd, isqrt
+from operator import add, floordiv, rshift
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Sieve bytes hold 0/1 per odd number; these tables convert to and from the
+# ASCII digits used to pack them into a binary integer.
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _pack_bits(flags: bytearray) -> bytes:
+    """Pack a bytearray of 0/1 flags into a little-endian bitset."""
+    nbytes = (len(flags) + 7) // 8
+    if not flags:
+        return b""
+    return int(flags.translate(_TO_DIGITS)[::-1], 2).to_bytes(nbytes, "little")
+
+
+def _unpack_bits(bits: bytes, nflags: int) -> bytearray:
+    """Inverse of `_pack_bits`: expand a bitset back into 0/1 flags."""
+    if not nflags:
+        return bytearray()
+    digits = format(int.from_bytes(bits, "little"), "0%db" % nflags)
+    return bytearray(digits[::-1].encode("ascii").translate(_FROM_DIGITS))
+
+
+def simple_sieve(limit: int) -> List[int]:
+    """Return all primes <= limit using a plain odd-only sieve.
+
+    Examples:
+    >>> simple_sieve(20)
+    [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    if limit < 2:
+        return []
+    size = (limit - 1) // 2  # odd numbers 3, 5, ..., <= limit
+    flags = bytearray(b"\x01") * size
+    for i in range((isqrt(limit) - 1) // 2):
+        if flags[i]:
+            p = 2 * i + 3
+            start = (p * p - 3) // 2
+            flags[start::p] = bytes(len(range(start, size, p)))
+    return [2] + list(compress(range(3, limit + 1, 2), flags))
+
+
+class SegmentedSieve:
+    """Segmented, odd-only bitset sieve for bulk primality queries.
+
+    Segment k covers the integers [k*S, (k+1)*S) where S is `segment_size`.
+    Built segments are cached as packed bitsets; at most `max_segments` are
+    kept, least recently used first out.
+
+    Values at or above `limit` are not sieved; they fall back to the scalar
+    `fallback` test (`is_prime_fast` by default).
+
+    If `table` is a PrimeTable, segments it fully covers are read straight
+    from its memory map instead of being sieved.
+    """
+
+    def __init__(
+        self,
+        segment_size: int = 1 << 20,
+        max_segments: int = 16,
+        limit: int = 10**12,
+        fallback=None,
+        table: "Optional[PrimeTable]" = None,
+    ) -> None:
+        if segment_size < 16 or segment_size % 16:
+            raise ValueError("segment_size must be a positive multiple of 16")
+        if max_segments < 1:
+            raise ValueError("max_segments must be at least 1")
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.limit = limit
+        self._fallback = fallback or is_prime_fast
+        self.table = table
+        self._base: List[int] = []
+        self._base_limit = 1
+        self._segments: "OrderedDict[int, bytes]" = OrderedDict()
+
+    # -- internals -------------------------------------------------------
+
+    def _ensure_base(self, limit: int) -> None:
+        """Make sure the base primes cover every p with p*p <= limit."""
+        root = isqrt(limit)
+        if root > self._base_limit:
+            self._base_limit = max(root, 2 * self._base_limit)
+            self._base = simple_sieve(self._base_limit)
+
+    def _sieve_segment(self, k: int) -> bytearray:
+        """Sieve segment k and return one 0/1 flag per odd number in it."""
+        lo = k * self.segment_size
+        hi = lo + self.segment_size
+        half = self.segment_size // 2
+        self._ensure_base(hi - 1)
+        flags = bytearray(b"\x01") * half
+        # flags[j] stands for the odd number lo + 2*j + 1
+        for p in self._base[1:bisect_right(self._base, isqrt(hi - 1))]:
+            start = max(p * p, (lo + p - 1) // p * p)
+            if not start & 1:
+                start += p
+            j = (start - lo) // 2
+            if j < half:
+                flags[j::p] = bytes((half - 1 - j) // p + 1)
+        if k == 0:
+            flags[0] = 0  # 1 is not prime
+        return flags
+
+    def _table_bits(self, k: int) -> Optional[bytes]:
+        """Return segment k from the attached table, or None if not covered."""
+        if self.table is None or (k + 1) * self.segment_size > self.table.limit:
+            return None
+        return self.table.bits(k * self.segment_size, (k + 1) * self.segment_size)
+
+    def _store(self, k: int, flags: bytearray) -> bytes:
+        """Cache the packed form of segment k, evicting the oldest segment."""
+        bits = _pack_bits(flags)
+        self._segments[k] = bits
+        if len(self._segments) > self.max_segments:
+            self._segments.popitem(last=False)
+        return bits
+
+    def _segment_bits(self, k: int) -> bytes:
+        """Return the packed bitset for segment k, building it if needed."""
+        bits = self._segments.get(k)
+        if bits is None:
+            bits = self._table_bits(k)
+            if bits is not None:
+                return bits
+            return self._store(k, self._sieve_segment(k))
+        self._segments.move_to_end(k)
+        return bits
+
+    def _segment_flags(self, k: int) -> bytearray:
+        """Return segment k as one 0/1 flag per odd number."""
+        bits = self._segments.get(k)
+        if bits is None:
+            bits = self._table_bits(k)
+            if bits is not None:
+                return _unpack_bits(bits, self.segment_size // 2)
+            flags = self._sieve_segment(k)
+            self._store(k, flags)
+            return flags
+        self._segments.move_to_end(k)
+        return _unpack_bits(bits, self.segment_size // 2)
+
+    # -- public API ------------------------------------------------------
+
+    def is_prime(self, n: int) -> bool:
+        """Return True if n is prime (O(1) once n's segment is cached)."""
+        if n < 3:
+            return n == 2
+        if not n & 1:
+            return False
+        if self.table is not None and n < self.table.limit:
+            return n in self.table
+        if n >= self.limit:
+            return self._fallback(n)
+        k, offset = divmod(n, self.segment_size)
+        j = offset >> 1
+        return bool(self._segment_bits(k)[j >> 3] >> (j & 7) & 1)
+
+    def is_prime_many(self, values: Iterable[int], min_hits: int = 64) -> List[bool]:
+        """Return a list of primality flags for `values`, in input order.
+
+        Queries are grouped by segment. A segment that is not cached yet is
+        only sieved when at least `min_hits` queries fall into it; sparse
+        values use the scalar fallback instead, which is cheaper than
+        sieving a whole segment for a single lookup.
+        """
+        values = list(values)
+        by_segment: Dict[int, List[int]] = {}
+        for n in values:
+            if 3 <= n < self.limit and n & 1:
+                by_segment.setdefault(n // self.segment_size, []).append(n)
+
+        # Resolve one segment at a time so the LRU never thrashes, however
+        # the queries are ordered.
+        known: Dict[int, bool] = {}
+        for k, members in by_segment.items():
+            cached = k in self._segments or self._table_bits(k) is not None
+            if not cached and len(members) < min_hits:
+                for n in members:
+                    known[n] = self._fallback(n)
+                continue
+            bits = self._segment_bits(k)
+            base = k * self.segment_size
+            for n in members:
+                j = (n - base) >> 1
+                known[n] = bool(bits[j >> 3] >> (j & 7) & 1)
+
+        return [known[n] if n in known else self.is_prime(n) for n in values]
+
+    def primes_in_range(self, lo: int, hi: int) -> Iterator[int]:
+        """Yield the primes p with lo <= p < hi, in increasing order.
+
+        Memory stays bounded by the segment cache no matter how wide the
+        range is.
+        """
+        lo = max(lo, 0)
+        if hi > self.limit:
+            raise ValueError("range exceeds sieve limit %d" % self.limit)
+        if lo <= 2 < hi:
+            yield 2
+        size = self.segment_size
+        for k in range(lo // size, (hi - 1) // size + 1 if hi > lo else 0):
+            base = k * size
+            first = max(lo, base) - base
+            last = min(hi, base + size) - base
+            # odd numbers base + 2*j + 1 with first <= 2*j + 1 < last
+            j0 = first // 2
+            j1 = last // 2
+            if j1 <= j0:
+                continue
+            flags = self._segment_flags(k)
+            yield from compress(range(base + 2 * j0 + 1, base + 2 * j1 + 1, 2), flags[j0:j1])
+
+
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+# Witness set proven to make Miller-Rabin deterministic for all n < 2**64
+# (Jim Sinclair, 2011).
+_MR_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+def miller_rabin(n: int, bases: Iterable[int]) -> bool:
+    """Strong probable-prime test of odd n > 2 for each base in `bases`."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n & 7 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas(n: int) -> bool:
+    """Strong Lucas probable-prime test with Selfridge's parameters."""
+    if isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d = n + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            # halve modulo n (n is odd)
+            U = (U + n if U & 1 else U) // 2 % n
+            V = (V + n if V & 1 else V) // 2 % n
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+def bpsw(n: int) -> bool:
+    """Baillie-PSW test: base-2 strong test plus a strong Lucas test.
+
+    No counterexample is known; it is the probabilistic mode used above
+    2**64.
+    """
+    return miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+def is_prime_fast(n: int) -> bool:
+    """Primality test that scales to large integers.
+
+    Uses deterministic Miller-Rabin for n < 2**64 and BPSW above that.
+
+    Examples:
+    >>> is_prime_fast(2**61 - 1)
+    True
+    >>> is_prime_fast(2**64 + 1)
+    False
+    """
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < 2209:  # 47**2: no small factor means prime
+        return True
+    if n < 1 << 64:
+        return miller_rabin(n, _MR_BASES_64)
+    return bpsw(n)
+
+
+def _brent_factor(n: int) -> int:
+    """Return a non-trivial factor of the odd composite n (Pollard-Brent)."""
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        m = 128  # steps between gcd checks
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # the batched product overshot; redo the last block one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+
+class Factorizer:
+    """Integer factorization with a reusable table of small primes.
+
+    Factors up to `small_prime_bound` are removed by trial division; what is
+    left is split with Pollard-rho (Brent's variant) and checked with
+    `is_prime_fast`. Keep one instance around to factor many numbers.
+    """
+
+    def __init__(self, small_prime_bound: int = 1000) -> None:
+        self.small_prime_bound = small_prime_bound
+        self.small_primes = simple_sieve(small_prime_bound)
+
+    def factorize(self, n: int) -> Dict[int, int]:
+        """Return the prime factorization of n as {prime: multiplicity}.
+
+        Raises ValueError for n < 1. factorize(1) is the empty map.
+        """
+        if n < 1:
+            raise ValueError("factorize() requires a positive integer")
+        factors: Dict[int, int] = {}
+        for p in self.small_primes:
+            if p * p > n:
+                break
+            if n % p == 0:
+                e = 0
+                while n % p == 0:
+                    n //= p
+                    e += 1
+                factors[p] = e
+        if n == 1:
+            return factors
+
+        bound_sq = (self.small_prime_bound + 1) ** 2
+        pending = [n]
+        while pending:
+            m = pending.pop()
+            # m has no prime factor <= small_prime_bound
+            if m < bound_sq or is_prime_fast(m):
+                factors[m] = factors.get(m, 0) + 1
+                continue
+            d = _brent_factor(m)
+            pending.append(d)
+            pending.append(m // d)
+        return dict(sorted(factors.items()))
+
+    def factorize_many(self, values: Iterable[int]) -> List[Dict[int, int]]:
+        """Factorize every value, sharing this instance's small-prime table."""
+        return [self.factorize(n) for n in values]
+
+
+# On-disk layout of a prime table: a fixed header followed by one bit per
+# odd number below `limit` (bit i is set when 2*i + 1 is prime).
+_TABLE_MAGIC = b"PRIMEBM1"
+_TABLE_HEADER = struct.Struct("<8sQ16x")
+
+
+def build_prime_table(path: str, limit: int, segment_size: int = 1 << 20) -> None:
+    """Sieve every odd number below `limit` and write the bitmap to `path`.
+
+    The table is built segment by segment, so memory stays bounded by
+    `segment_size`, and it is written to a temporary file that is renamed
+    into place, so readers never see a half-written table. It takes
+    limit/16 bytes on disk (about 62 MB for limit=10**9).
+    """
+    if limit < 0:
+        raise ValueError("limit must be non-negative")
+    sieve = SegmentedSieve(segment_size=segment_size, max_segments=1, limit=limit + segment_size)
+    tmp_path = "%s.tmp%d" % (path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(_TABLE_HEADER.pack(_TABLE_MAGIC, limit))
+        remaining = limit // 2  # odd numbers below limit
+        k = 0
+        while remaining > 0:
+            flags = sieve._sieve_segment(k)[:remaining]
+            f.write(_pack_bits(flags))
+            remaining -= len(flags)
+            k += 1
+    os.replace(tmp_path, path)
+
+
+class PrimeTable:
+    """Read-only, memory-mapped view of a table written by build_prime_table.
+
+    Opening a table only maps the file, so it costs microseconds, and every
+    process that maps the same file shares a single page-cache copy. A
+    typical pool setup is:
+
+        ProcessPoolExecutor(initializer=load_prime_table, initargs=(path,))
+
+    Values at or above `limit` fall back to `is_prime_fast`.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, limit = _TABLE_HEADER.unpack_from(self._mm)
+        except struct.error:
+            magic, limit = b"", 0
+        if magic != _TABLE_MAGIC:
+            self._mm.close()
+            raise ValueError("%s is not a prime table" % path)
+        self.limit = limit
+        self.path = path
+
+    def __contains__(self, n: int) -> bool:
+        if n < 3:
+            return n == 2
+        if not n & 1:
+            return False
+        if n >= self.limit:
+            return is_prime_fast(n)
+        j = n >> 1
+        return bool(self._mm[_TABLE_HEADER.size + (j >> 3)] >> (j & 7) & 1)
+
+    def is_prime(self, n: int) -> bool:
+        """Return True if n is prime, with a single bit test below `limit`."""
+        return n in self
+
+    def bits(self, lo: int, hi: int) -> bytes:
+        """Return the packed bits for the odd numbers in [lo, hi).
+
+        Both bounds must be multiples of 16 so the slice is byte aligned.
+        """
+        start = _TABLE_HEADER.size + lo // 16
+        return self._mm[start:start + (hi - lo) // 16]
+
+    def primes_in_range(self, lo: int, hi: int, block: int = 1 << 20) -> Iterator[int]:
+        """Yield the primes in [lo, hi), reading at most `block` numbers at a time."""
+        lo = max(lo, 0)
+        if hi > self.limit:
+            raise ValueError("range exceeds table limit %d" % self.limit)
+        if lo <= 2 < hi:
+            yield 2
+        j = (lo | 1) >> 1  # first odd number >= lo
+        end = hi >> 1  # one past the index of the last odd number < hi
+        step = max(block // 2, 8)
+        while j < end:
+            stop = min(j + step, end)
+            start_byte = j >> 3
+            raw = self._mm[_TABLE_HEADER.size + start_byte:_TABLE_HEADER.size + ((stop + 7) >> 3)]
+            flags = _unpack_bits(raw, len(raw) * 8)
+            skip = j & 7
+            yield from compress(range(2 * j + 1, 2 * stop + 1, 2), flags[skip:skip + stop - j])
+            j = stop
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "PrimeTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _icbrt(n: int) -> int:
+    """Integer cube root: the largest r with r**3 <= n."""
+    r = int(round(n ** (1.0 / 3)))
+    while r ** 3 > n:
+        r -= 1
+    while (r + 1) ** 3 <= n:
+        r += 1
+    return r
+
+
+class _PrimeCounter:
+    """Sieve-backed tables for Meissel-Lehmer prime counting.
+
+    pi(y) for y <= limit is two array lookups: `_base` holds the count at
+    the start of each block of 2**16 odd numbers and `_low` the running
+    count inside the block (it fits in 16 bits). phi(y, b) for b <= 7 comes
+    from primorial tables, and for small y from a dense table built on
+    demand by reserve_small(). `primes` lists the primes up to
+    `prime_bound`.
+    """
+
+    _K = 7  # phi(y, b) for b <= _K is read from the primorial tables
+
+    def __init__(self, limit: int, prime_bound: int) -> None:
+        self.limit = limit
+        # flags[k] is 1 when 2*k - 1 is prime, so pi(y) uses k = (y + 1) // 2
+        size = (limit + 1) // 2 + 1
+        flags = bytearray(b"\x01") * size
+        flags[0] = flags[1] = 0
+        for k in range(2, (isqrt(limit) + 1) // 2 + 1):
+            if flags[k]:
+                p = 2 * k - 1
+                start = (p * p + 1) // 2
+                flags[start::p] = bytes(len(range(start, size, p)))
+
+        view = memoryview(flags)
+        self._base = array("q")
+        self._low = array("H")
+        count = 1  # the prime 2
+        for start in range(0, size, 1 << 16):
+            self._base.append(count)
+            self._low.extend(accumulate(view[start:start + (1 << 16)]))
+            count += self._low[-1]
+
+        bound = min(prime_bound, limit)
+        self.prime_bound = bound
+        self.primes = [2] + list(compress(range(-1, bound + 1, 2), view[:(bound + 1) // 2 + 1]))
+
+        self._tables = []
+        q = 1
+        for b in range(self._K + 1):
+            if b:
+                q *= self.primes[b - 1]
+            coprime = bytearray(b"\x01") * (q + 1)
+            coprime[0] = 0
+            for p in self.primes[:b]:
+                coprime[::p] = bytes(len(range(0, q + 1, p)))
+            self._tables.append((q, array("q", accumulate(coprime))))
+
+        self._cubes = [p * p * p for p in self.primes]
+        self._small_bound = 0
+        self._small = array("H")
+        self._offsets: List[int] = []
+
+    def reserve_small(self, bound: int) -> None:
+        """Make phi(y, b) for y < bound (at most 2**18) a table lookup.
+
+        The recursion only asks for phi(y, b) with y >= p_b**2, so the table
+        needs one row per b > K with p_b**2 < bound: about 1.5 MB at 2**16
+        and 17 MB at 2**18. Values stay below 0.19 * y, so they fit in 16
+        bits. A table that already covers `bound` is kept.
+        """
+        if bound <= self._small_bound:
+            return
+        coprime = bytearray(b"\x01") * bound
+        coprime[0] = 0
+        for p in self.primes[:self._K]:
+            coprime[::p] = bytes(len(range(0, bound, p)))
+        small = array("H")
+        for p in self.primes[self._K:bisect_right(self.primes, isqrt(bound - 1))]:
+            small.extend(accumulate(coprime))
+            coprime[::p] = bytes(len(range(0, bound, p)))
+        self._small = small
+        self._small_bound = bound
+        # row of b starts at _offsets[b - K]
+        self._offsets = list(range(0, len(small), bound))
+
+    def pi(self, y: int) -> int:
+        """Return pi(y) for y <= limit."""
+        if y < 2:
+            return 0
+        k = (y + 1) >> 1
+        return self._base[k >> 16] + self._low[k]
+
+    def pi_sum(self, values: List[int]) -> int:
+        """Return the sum of pi(v) over values (each 2 <= v <= limit)."""
+        ks = list(map(rshift, map(add, values, repeat(1)), repeat(1)))
+        blocks = map(rshift, ks, repeat(16))
+        return sum(map(self._base.__getitem__, blocks)) + sum(map(self._low.__getitem__, ks))
+
+    def phi(self, y: int, b: int) -> int:
+        """Count 1 <= n <= y with no prime factor among the first b primes."""
+        if b <= self._K:
+            q, table = self._tables[b]
+            return y // q * table[q] + table[y % q]
+        primes = self.primes
+        if y < primes[b] ** 2 and y <= self.limit:
+            # only 1 and the primes in (p_b, y] survive
+            return max(self.pi(y) - b + 1, 1) if y else 0
+        if y < self._small_bound:
+            return self._small[self._offsets[b - self._K] + y]
+
+        q, table = self._tables[self._K]
+        result = y // q * table[q] + table[y % q]
+        # phi(y, b) = phi(y, K) - sum of phi(y // p_i, i - 1) for K < i <= b
+        i = self._K
+        cube = min(b, bisect_right(self._cubes, y, i))
+        while i < cube:
+            p = primes[i]
+            if y // p < self._small_bound:
+                # the remaining terms up to the cube root are table rows
+                # (y // p >= p**2, so each row exists)
+                small = list(map(floordiv, repeat(y, cube - i), primes[i:cube]))
+                rows = self._offsets[i - self._K:cube - self._K]
+                result -= sum(map(self._small.__getitem__, map(add, rows, small)))
+                i = cube
+                break
+            result -= self.phi(y // p, i)
+            i += 1
+        if i == b:
+            return result
+        # From here on y // p < p**2, so each term is a leaf:
+        # phi(y // p_i, i - 1) = pi(y // p_i) - i + 2 (1-based i).
+        j = min(b, bisect_right(primes, isqrt(y), i))
+        if j > i:
+            leaves = list(map(floordiv, repeat(y, j - i), primes[i:j]))
+            result -= self.pi_sum(leaves) - (i + j - 1) * (j - i) // 2 + (j - i)
+            i = j
+        # Primes in (sqrt(y), min(y, p_b)] leave y // p < p: each term is 1.
+        if i < b:
+            top = b if primes[b - 1] <= y else self.pi(y)
+            if top > i:
+                result -= top - i
+        return result
+
+
+# Shared engines used by the module-level helpers below.
+_default_sieve = SegmentedSieve()
+_default_factorizer = Factorizer()
+_counter: Optional[_PrimeCounter] = None
+
+
+def is_prime_many(values: Iterable[int]) -> List[bool]:
+    """Return primality flags for every value, using the shared sieve.
+
+    Examples:
+    >>> is_prime_many([1, 2, 9, 11])
+    [False, True, False, True]
+    """
+    return _default_sieve.is_prime_many(values)
+
+
+def primes_in_range(lo: int, hi: int) -> Iterator[int]:
+    """Yield the primes in [lo, hi) using the shared sieve.
+
+    Examples:
+    >>> list(primes_in_range(10, 30))
+    [11, 13, 17, 19, 23, 29]
+    """
+    return _default_sieve.primes_in_range(lo, hi)
+
+
+def factorize(n: int) -> Dict[int, int]:
+    """Return the prime factorization of n as {prime: multiplicity}.
+
+    Examples:
+    >>> factorize(360)
+    {2: 3, 3: 2, 5: 1}
+    >>> factorize(2**64 + 1)
+    {274177: 1, 67280421310721: 1}
+    """
+    return _default_factorizer.factorize(n)
+
+
+def factorize_many(values: Iterable[int]) -> List[Dict[int, int]]:
+    """Factorize every value with the shared small-prime table."""
+    return _default_factorizer.factorize_many(values)
+
+
+def prime_pi(x: int) -> int:
+    """Return the number of primes <= x without enumerating them.
+
+    Uses Meissel-Lehmer counting: with a = pi(x**(1/3)) and b = pi(√x),
+
+        pi(x) = phi(x, a) + a - 1 - sum(pi(x // p_i) - i + 1, a < i <= b)
+
+    where phi(x, a) counts the integers <= x free of the first a primes.
+    The sieve-backed tables behind pi() and phi() cover x**(2/3) and are
+    cached between calls, so later calls of the same or smaller size skip
+    the sieve. Memory is about 1.5 * x**(2/3) bytes while the tables are
+    built. Afterwards the process keeps about x**(2/3) bytes for pi(),
+    plus a dense phi table of up to 17 MB and the primes up to 2 * √x:
+    about 37 MB after x = 10**11 and 120 MB after 10**12. Call
+    prime_pi_cache_clear() to release them. See
+    benchmarks/bench_prime_pi.py for timings against the naive is_prime
+    loop.
+
+    Examples:
+    >>> prime_pi(100)
+    25
+    >>> prime_pi(10**9)
+    50847534
+    """
+    global _counter
+    if x < 2:
+        return 0
+    root = isqrt(x)
+    cube = _icbrt(x)
+    # x // p <= (cube + 1)**2 for every p > cube; unlike x // cube this
+    # grows with x, so a cached table also serves slightly smaller x
+    limit = max((cube + 1) ** 2, 2 * root + 100, 1000)
+    if _counter is None or _counter.limit < limit or _counter.prime_bound < 2 * root + 100:
+        _counter = _PrimeCounter(limit, 2 * root + 100)
+    counter = _counter
+    if x <= counter.limit:
+        return counter.pi(x)
+
+    # a dense phi table for y up to about sqrt(x) / 8 saves far more
+    # recursion than it costs to build
+    counter.reserve_small(1 << min(18, max(10, (root >> 3).bit_length())))
+    a = counter.pi(cube)
+    b = counter.pi(root)
+    result = counter.phi(x, a) + a - 1
+    # P2: integers <= x with exactly two prime factors, both > p_a
+    result -= counter.pi_sum([x // p for p in counter.primes[a:b]]) - (a + b - 1) * (b - a) // 2
+    return result
+
+
+def prime_pi_cache_clear() -> None:
+    """Release the tables prime_pi() keeps between calls."""
+    global _counter
+    _counter = None
+
+
+def load_prime_table(path: str) -> PrimeTable:
+    """Map a prime table and use it for the shared bulk helpers above.
+
+    Suitable as a ProcessPoolExecutor initializer: each worker maps the
+    same file read-only instead of sieving on start-up.
+    """
+    table = PrimeTable(path)
+    _default_sieve.table = table
+    return table
+
+
+def loaded_prime_table() -> Optional[PrimeTable]:
+    """Return the table mapped by load_prime_table(), or None."""
+    return _default_sieve.table
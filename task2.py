@@ -1,11 +1,47 @@
+import argparse
+import csv
+import io
+import json
+import sys
+from itertools import islice
+from typing import Iterable, List, Optional, TextIO, Tuple
 
-from typing import Iterable
+from factorials import FactorialCache, factorial, factorial_digits
+
+# Bulk queries (is_prime_many, primes_in_range) go through the shared
+# segmented sieve instead of running is_prime once per value. Worker
+# processes can call load_prime_table() to map a prebuilt table instead.
+# factorize() returns {prime: multiplicity} for callers that need more than
+# a yes/no answer.
+from primes import (
+	factorize,
+	factorize_many,
+	is_prime_fast,
+	is_prime_many,
+	load_prime_table,
+	loaded_prime_table,
+	prime_pi,
+	primes_in_range,
+)
+
+# Below this bound trial division beats Miller-Rabin (measured crossover is
+# around 2**18 for primes); above it is_prime switches to is_prime_fast.
+TRIAL_DIVISION_LIMIT = 1 << 18
+
+# interactive_main reuses factorial checkpoints between prompts. It only
+# computes n <= 1000, so checkpoints every 50 keep each request within 49
+# multiplications of a cached value (about 10 KB for the whole range).
+_factorial_cache = FactorialCache(step=50)
 
 
 def is_prime(n: int) -> bool:
 	"""Return True if n is prime, otherwise False.
 
-	
+	Below the limit of a table mapped with load_prime_table() this is a
+	single bit test. Otherwise small n use 6k±1 trial division and larger
+	n go to primes.is_prime_fast, which is deterministic Miller-Rabin
+	below 2**64 and BPSW above it.
+
 	Examples:
 	>>> is_prime(2)
 	True
@@ -14,112 +50,212 @@ def is_prime(n: int) -> bool:
 	>>> is_prime(17)
 	True
 	"""
-	from typing import Iterable
+	if n <= 1:
+		return False
+	table = loaded_prime_table()
+	if table is not None and n < table.limit:
+		return n in table
+	if n <= 3:
+		return True
+	if n % 2 == 0 or n % 3 == 0:
+		return False
+	if n >= TRIAL_DIVISION_LIMIT:
+		return is_prime_fast(n)
 
+	i = 5
+	# check divisors up to sqrt(n), step by 6 (i and i+2 are 6k-1 and 6k+1)
+	while i * i <= n:
+		if n % i == 0 or n % (i + 2) == 0:
+			return False
+		i += 6
+	return True
 
-	def is_prime(n: int) -> bool:
-		"""Return True if n is prime, otherwise False.
 
-		Examples:
-		>>> is_prime(2)
-		True
-		>>> is_prime(15)
-		False
-		>>> is_prime(17)
-		True
-		"""
-		if n <= 1:
-			return False
-		if n <= 3:
-			return True
-		if n % 2 == 0 or n % 3 == 0:
-			return False
+def run_tests(cases: Iterable[int]) -> None:
+	"""Run quick checks and print results for given cases."""
+	for x in cases:
+		print(f"{x}: {'prime' if is_prime(x) else 'composite'}")
 
-		i = 5
-		# check divisors up to sqrt(n), step by 6 (i and i+2 are 6k-1 and 6k+1)
-		while i * i <= n:
-			if n % i == 0 or n % (i + 2) == 0:
-				return False
-			i += 6
-		return True
 
+def factorial_recursive(n: int) -> int:
+	"""Compute factorial of n using recursion.
 
-	def run_tests(cases: Iterable[int]) -> None:
-		"""Run quick checks and print results for given cases."""
-		for x in cases:
-			print(f"{x}: {'prime' if is_prime(x) else 'composite'}")
+	- Raises ValueError for negative inputs.
+	- Uses the mathematical definition:
+		0! = 1
+		n! = n * (n-1)!  for n > 0
 
+	Note: Recursive approach is simple and mirrors the definition, but it
+	can lead to deep recursion for large n (Python recursion limit).
+	"""
+	if n < 0:
+		raise ValueError("factorial is not defined for negative numbers")
+	if n <= 1:
+		return 1
+	return n * factorial_recursive(n - 1)
 
-	def factorial_recursive(n: int) -> int:
-		"""Compute factorial of n using recursion.
 
-		- Raises ValueError for negative inputs.
-		- Uses the mathematical definition:
-			0! = 1
-			n! = n * (n-1)!  for n > 0
+def factorial_iterative(n: int, workers: Optional[int] = None) -> int:
+	"""Compute factorial of n without recursion.
 
-		Note: Recursive approach is simple and mirrors the definition, but it
-		can lead to deep recursion for large n (Python recursion limit).
-		"""
-		if n < 0:
-			raise ValueError("factorial is not defined for negative numbers")
-		if n <= 1:
-			return 1
-		return n * factorial_recursive(n - 1)
+	- Raises ValueError for negative inputs.
+	- Delegates to the shared product-tree engine in factorials.py, which
+	  multiplies balanced halves instead of one term at a time, so large n
+	  avoid both recursion limits and the quadratic linear product.
+	- `workers` > 1 spreads the work over a process pool for very large n.
+	"""
+	return factorial(n, workers=workers)
 
 
-	def factorial_iterative(n: int) -> int:
-		"""Compute factorial of n using an iterative loop.
+def interactive_main() -> None:
+	"""Prompt the user for integers and report primality and factorials.
+
+	- Enter an integer to test for primality and show its factorial (if
+	  reasonably sized). Press Enter on an empty line to exit.
+	"""
+	print("Prime & Factorial utility — enter an integer to test (press Enter to quit)")
+	while True:
+		try:
+			s = input("Enter integer: ").strip()
+		except EOFError:
+			print()
+			break
+		if s == "":
+			print("Exiting.")
+			break
+		try:
+			n = int(s)
+		except ValueError:
+			print("Invalid input. Please enter a valid integer.")
+			continue
+
+		# primality
+		if is_prime(n):
+			print(f"{n} is prime.")
+		else:
+			print(f"{n} is not prime.")
 
-		- Raises ValueError for negative inputs.
-		- More efficient in Python for large n because it avoids recursion depth
-		  limits and function call overhead.
-		"""
+		# factorial (guarded to avoid huge output)
 		if n < 0:
-			raise ValueError("factorial is not defined for negative numbers")
-		result = 1
-		for i in range(2, n + 1):
-			result *= i
-		return result
+			print("factorial not defined for negative numbers")
+		elif n > 1000:
+			print("factorial too large to compute/display (n > 1000)")
+		else:
+			print(f"{n}! = {_factorial_cache.get(n)}")
 
 
-	def interactive_main() -> None:
-		"""Prompt the user for integers and report primality and factorials.
+# A batch record is (raw, n, prime, digits, error); n is None for error records.
+_Record = Tuple[str, Optional[int], bool, Optional[int], Optional[str]]
 
-		- Enter an integer to test for primality and show its factorial (if
-		  reasonably sized). Press Enter on an empty line to exit.
-		"""
-		print("Prime & Factorial utility — enter an integer to test (press Enter to quit)")
-		while True:
-			try:
-				s = input("Enter integer: ").strip()
-			except EOFError:
-				print()
-				break
-			if s == "":
-				print("Exiting.")
-				break
+
+def _format_jsonl(records: List[_Record], with_digits: bool) -> str:
+	lines = []
+	for raw, n, prime, digits, error in records:
+		if n is None:
+			lines.append('{"input": %s, "error": %s}\n' % (json.dumps(raw), json.dumps(error)))
+			continue
+		record = '{"n": %d, "prime": %s' % (n, "true" if prime else "false")
+		if with_digits:
+			record += ', "factorial_digits": %s' % ("null" if digits is None else digits)
+		lines.append(record + "}\n")
+	return "".join(lines)
+
+
+def _format_csv(records: List[_Record], with_digits: bool) -> str:
+	buf = io.StringIO()
+	writer = csv.writer(buf, lineterminator="\n")
+	for raw, n, prime, digits, error in records:
+		if n is None:
+			row = [raw, ""] + ([""] if with_digits else []) + [error]
+		else:
+			row = [n, "true" if prime else "false"] + ([digits] if with_digits else []) + [""]
+		writer.writerow(row)
+	return buf.getvalue()
+
+
+def batch_main(
+	source: TextIO,
+	out: TextIO,
+	fmt: str = "jsonl",
+	with_digits: bool = False,
+	chunk_size: int = 65536,
+) -> int:
+	"""Stream integers (one per line) from `source` and write results to `out`.
+
+	- Lines are read `chunk_size` at a time; each chunk's primality checks
+	  go through the shared sieve engine (is_prime_many) in one call, and
+	  the chunk's output is written with a single write.
+	- `fmt` is "jsonl" or "csv". Each record has the number and its prime
+	  flag, plus the digit count of n! when `with_digits` is set (computed
+	  without building n!). Lines that are not integers, or whose results
+	  cannot be computed, produce an error record instead of stopping the
+	  run; blank lines are skipped.
+	- Returns the number of records written.
+	"""
+	if fmt not in ("jsonl", "csv"):
+		raise ValueError("fmt must be 'jsonl' or 'csv'")
+	formatter = _format_jsonl if fmt == "jsonl" else _format_csv
+	if fmt == "csv":
+		header = ["n", "prime"] + (["factorial_digits"] if with_digits else []) + ["error"]
+		csv.writer(out, lineterminator="\n").writerow(header)
+
+	written = 0
+	lines = iter(source)
+	while True:
+		chunk = [s.strip() for s in islice(lines, chunk_size)]
+		if not chunk:
+			break
+		raws = [s for s in chunk if s]
+		values: List[Optional[int]] = []
+		for s in raws:
 			try:
-				n = int(s)
+				values.append(int(s))
 			except ValueError:
-				print("Invalid input. Please enter a valid integer.")
-				continue
+				values.append(None)
+		flags = iter(is_prime_many(n for n in values if n is not None))
 
-			# primality
-			if is_prime(n):
-				print(f"{n} is prime.")
-			else:
-				print(f"{n} is not prime.")
+		records: List[_Record] = []
+		for raw, n in zip(raws, values):
+			if n is None:
+				records.append((raw, None, False, None, "invalid integer"))
+				continue
+			prime = next(flags)
+			try:
+				digits = factorial_digits(n) if with_digits and n >= 0 else None
+			except (ArithmeticError, ValueError) as exc:
+				records.append((raw, None, False, None, "factorial_digits failed: %s" % exc))
+				continue
+			records.append((raw, n, prime, digits, None))
+		out.write(formatter(records, with_digits))
+		written += len(records)
+	out.flush()
+	return written
 
-			# factorial (guarded to avoid huge output)
-			if n < 0:
-				print("factorial not defined for negative numbers")
-			elif n > 1000:
-				print("factorial too large to compute/display (n > 1000)")
-			else:
-				print(f"{n}! = {factorial_iterative(n)}")
 
+def main(argv: Optional[List[str]] = None) -> None:
+	"""Run interactively, or in streaming batch mode with --batch."""
+	parser = argparse.ArgumentParser(description="Prime & factorial utility")
+	parser.add_argument("--batch", action="store_true", help="read integers non-interactively, one per line")
+	parser.add_argument("-i", "--input", help="input file for --batch (default: stdin)")
+	parser.add_argument("-o", "--output", help="output file for --batch (default: stdout)")
+	parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+	parser.add_argument("--digits", action="store_true", help="include the digit count of n!")
+	args = parser.parse_args(argv)
 
-	if __name__ == "__main__":
+	if not args.batch:
 		interactive_main()
+		return
+	source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+	out = open(args.output, "w", encoding="utf-8", buffering=1 << 20) if args.output else sys.stdout
+	try:
+		batch_main(source, out, fmt=args.format, with_digits=args.digits)
+	finally:
+		if args.input:
+			source.close()
+		if args.output:
+			out.close()
+
+
+if __name__ == "__main__":
+	main()
 
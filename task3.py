@@ -1,3 +1,13 @@
+import mmap
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import BinaryIO, FrozenSet, Iterable, List, Optional, Union
+
+from factorials import factorial
+
+
 # Function to reverse a string
 def reverse_string(s: str) -> str:
 	"""Return the reverse of the input string `s`.
@@ -14,6 +24,199 @@ def reverse_string(s: str) -> str:
 	return s[::-1]
 
 
+# Streaming reversal for files too large to hold in memory
+def reverse_file(
+	src_path: str,
+	dst: Union[str, BinaryIO],
+	block_size: int = 1 << 20,
+	use_mmap: bool = False,
+) -> int:
+	"""Write the reverse of the UTF-8 file `src_path` to `dst`.
+
+	Gives the same result as reverse_string(text) on the decoded file, but
+	reads fixed-size blocks from the end of the file (or of a memory map
+	with `use_mmap`) and writes each reversed block forward, so memory is
+	bounded by `block_size` rather than the file size.
+
+	A block may start in the middle of a multi-byte character. Those
+	leading continuation bytes are carried over and appended to the next
+	(earlier) block, so every block decodes on code-point boundaries.
+
+	- `dst` is a path or a binary stream.
+	- Raises ValueError if `dst` is the source file itself, which could not
+	  be read back once truncated for writing.
+	- Raises UnicodeDecodeError if the file is not valid UTF-8.
+	- Returns the number of bytes written.
+	"""
+	if block_size < 1:
+		raise ValueError("block_size must be positive")
+	written = 0
+	with open(src_path, "rb") as f:
+		if isinstance(dst, (str, os.PathLike)):
+			if os.path.exists(dst) and os.path.samefile(src_path, dst):
+				raise ValueError("dst must not be the source file")
+			out = open(dst, "wb")
+		else:
+			out = dst
+		try:
+			size = os.fstat(f.fileno()).st_size
+			mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap and size else None
+			try:
+				end = size
+				carry = b""
+				while end > 0:
+					start = max(0, end - block_size)
+					if mm is not None:
+						block = mm[start:end] + carry
+					else:
+						f.seek(start)
+						block = f.read(end - start) + carry
+					i = 0
+					if start > 0:
+						# 0b10xxxxxx bytes continue a character that began earlier
+						while i < len(block) and block[i] & 0xC0 == 0x80:
+							i += 1
+						if i > 3:
+							block[:i].decode("utf-8")  # raises: no lead byte fits
+					carry = block[:i]
+					data = block[i:].decode("utf-8")[::-1].encode("utf-8")
+					out.write(data)
+					written += len(data)
+					end = start
+			finally:
+				if mm is not None:
+					mm.close()
+		finally:
+			if out is not dst:
+				out.close()
+	return written
+
+
+# Grapheme-aware reversal
+try:  # the third-party `regex` module implements full UAX #29 clusters (\X)
+	import regex as _regex
+except ImportError:
+	_regex = None
+
+_ZWJ = "\u200d"
+_REGIONAL_INDICATORS = "".join(map(chr, range(0x1F1E6, 0x1F200)))
+
+
+@lru_cache(maxsize=None)
+def _extenders() -> FrozenSet[str]:
+	"""Characters that never start a grapheme cluster on their own.
+
+	Combining marks (Mn, Me, Mc), ZWJ/ZWNJ, emoji skin-tone modifiers and
+	tag characters. Built on first use; marks only occur in planes 0-1 and
+	the variation selectors block of plane 14.
+	"""
+	marks = {
+		chr(c)
+		for block in (range(0x20000), range(0xE0100, 0xE01F0))
+		for c in block
+		if unicodedata.category(chr(c)) in ("Mn", "Me", "Mc")
+	}
+	marks.update("\u200c\u200d")
+	marks.update(map(chr, range(0x1F3FB, 0x1F400)))  # skin-tone modifiers
+	marks.update(map(chr, range(0xE0020, 0xE0080)))  # tags
+	return frozenset(marks)
+
+
+# Characters outside _extenders() that can still join a cluster: CR (CR LF),
+# Hangul jamo and regional indicators.
+_JOINERS = re.compile("[\r\u1100-\u11ff\ua960-\ua97f\ud7b0-\ud7ff\U0001f1e6-\U0001f1ff]")
+
+
+def _hangul_type(ch: str) -> str:
+	c = ord(ch)
+	if 0x1100 <= c <= 0x115F or 0xA960 <= c <= 0xA97F:
+		return "L"
+	if 0x1160 <= c <= 0x11A7 or 0xD7B0 <= c <= 0xD7C6:
+		return "V"
+	if 0x11A8 <= c <= 0x11FF or 0xD7CB <= c <= 0xD7FB:
+		return "T"
+	if 0xAC00 <= c <= 0xD7A3:
+		return "LV" if (c - 0xAC00) % 28 == 0 else "LVT"
+	return ""
+
+
+def _is_regional_indicator(ch: str) -> bool:
+	return ch in _REGIONAL_INDICATORS
+
+
+def _graphemes(s: str) -> List[str]:
+	"""Split s into grapheme clusters.
+
+	Uses `regex` when installed. Otherwise applies the common UAX #29 rules:
+	CR LF, extending marks, ZWJ sequences, regional-indicator pairs and
+	Hangul syllable sequences (no Prepend or Indic conjunct rules).
+	"""
+	if _regex is not None:
+		return _regex.findall(r"\X", s)
+	extenders = _extenders()
+	clusters: List[str] = []
+	for ch in s:
+		if clusters:
+			last = clusters[-1]
+			prev = last[-1]
+			if prev == "\r":
+				join = ch == "\n"
+			elif prev == "\n":
+				join = False
+			elif ch in extenders or prev == _ZWJ:
+				join = True
+			elif _is_regional_indicator(ch):
+				# pair indicators up: join only onto an odd run of them
+				run = len(last) - len(last.rstrip(_REGIONAL_INDICATORS))
+				join = len(last) == run and run % 2 == 1
+			else:
+				before, after = _hangul_type(prev), _hangul_type(ch)
+				join = bool(before and after) and (
+					before == "L" and after in ("L", "V", "LV", "LVT")
+					or before in ("LV", "V") and after in ("V", "T")
+					or before in ("LVT", "T") and after == "T"
+				)
+			if join:
+				clusters[-1] = last + ch
+				continue
+		clusters.append(ch)
+	return clusters
+
+
+def reverse_many(strings: Iterable[str], mode: str = "codepoint") -> List[str]:
+	"""Reverse every string in `strings`.
+
+	- mode="codepoint" reverses code points, exactly like reverse_string.
+	- mode="grapheme" keeps user-perceived characters intact: combining
+	  accents stay on their letter, emoji ZWJ sequences and flags stay
+	  whole, and CR LF stays in order.
+
+	Grapheme mode only segments strings that need it. Pure ASCII and
+	Latin-1 text without CR (a C-level check) and strings with no character
+	that can extend a cluster take the plain slice path. See
+	benchmarks/bench_reverse.py for the cost on a mixed workload.
+
+	Examples:
+	>>> reverse_many(["abc", "e\u0301a"], mode="grapheme")
+	['cba', 'ae\u0301']
+	"""
+	if mode == "codepoint":
+		return [s[::-1] for s in strings]
+	if mode != "grapheme":
+		raise ValueError("mode must be 'codepoint' or 'grapheme'")
+	extenders = _extenders()
+	result = []
+	for s in strings:
+		if (s.isascii() or max(s) < "\u0300") and "\r" not in s:
+			# no combining marks exist below U+0300
+			result.append(s[::-1])
+		elif extenders.isdisjoint(s) and _JOINERS.search(s) is None:
+			result.append(s[::-1])
+		else:
+			result.append("".join(reversed(_graphemes(s))))
+	return result
+
+
 if __name__ == "__main__":
 	# quick demo when run directly
 	examples = ["hello", "AIPP", "12345", "RAM"]
@@ -40,19 +243,15 @@ def factorial_recursive(n: int) -> int:
 
 
 # Iterative factorial implementation
-def factorial_iterative(n: int) -> int:
-	"""Compute n! using an iterative loop.
+def factorial_iterative(n: int, workers: Optional[int] = None) -> int:
+	"""Compute n! without recursion.
 
 	- Raises ValueError for negative inputs.
-	- Preferred in Python for large n because it avoids recursion depth
-	  and function call overhead.
+	- Uses the shared product-tree engine in factorials.py, which is much
+	  faster than a term-by-term loop for large n.
+	- `workers` > 1 spreads the work over a process pool for very large n.
 	"""
-	if n < 0:
-		raise ValueError("factorial is not defined for negative numbers")
-	result = 1
-	for i in range(2, n + 1):
-		result *= i
-	return result
+	return factorial(n, workers=workers)
 
 
 if __name__ == "__main__":
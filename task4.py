@@ -1,9 +1,14 @@
 """Factorial examples (recursive and iterative).
 
 This module provides two implementations of factorial and a small demo when
-run as a script.
+run as a script. The iterative version uses the shared engine in
+factorials.py.
 """
 
+from typing import Optional
+
+from factorials import factorial
+
 
 # Recursive factorial implementation
 def factorial_recursive(n: int) -> int:
@@ -25,18 +30,15 @@ def factorial_recursive(n: int) -> int:
 
 
 # Iterative factorial implementation
-def factorial_iterative(n: int) -> int:
-    """Compute n! using an iterative loop.
+def factorial_iterative(n: int, workers: Optional[int] = None) -> int:
+    """Compute n! without recursion.
 
     - Raises ValueError for negative inputs.
-    - Preferred for large n to avoid recursion limits and overhead.
+    - Delegates to the shared product-tree engine in factorials.py, which
+      avoids recursion limits and the quadratic cost of a term-by-term loop.
+    - `workers` > 1 spreads the work over a process pool for very large n.
     """
-    if n < 0:
-        raise ValueError("factorial is not defined for negative numbers")
-    result = 1
-    for i in range(2, n + 1):
-        result *= i
-    return result
+    return factorial(n, workers=workers)
 
 
 if __name__ == "__main__":
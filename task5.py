@@ -5,9 +5,36 @@ This file demonstrates two ways to find the largest number in a list:
 - a thin wrapper around Python's built-in max() (also O(n) time)
 
 Both implementations validate input and handle common edge cases.
+
+For inputs too large for an element-by-element Python loop there is also a
+chunked reduction engine:
+- find_max_chunked() takes NumPy arrays (including memory maps),
+  array.array or other buffers, chunked generators, or plain iterables,
+  and reduces each chunk with a C loop (NumPy's when available)
+- find_max_file() memory-maps a raw binary numeric file and can split it
+  across a process pool, merging the partial maxima
+
+top_k() and argmax() return the positions of the largest values as well,
+and sliding_max() / sliding_max_array() compute rolling maxima in O(1)
+amortised time per element.
 """
 
-from typing import Iterable, Optional
+import heapq
+import mmap
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; chunks then go through max()
+    np = None
+
+# Elements per chunk: big enough to amortise per-chunk overhead, small
+# enough that a chunk of float64 (8 MB) stays cache- and memory-friendly.
+DEFAULT_CHUNK_SIZE = 1 << 20
 
 
 def find_max_iterative(nums: Iterable[float]) -> float:
@@ -41,6 +68,250 @@ def find_max_builtin(nums: Iterable[float]) -> float:
     return max(nums)
 
 
+def _chunk_max(chunk: Any) -> Any:
+    """Return the max of one non-empty chunk using a C-level loop.
+
+    NumPy reduces arrays and buffers. Lists go through the built-in max(),
+    also a C loop, which keeps big ints, Fractions and mixed int/float
+    values exact instead of converting them to an array dtype.
+    """
+    if np is not None:
+        if not isinstance(chunk, np.ndarray):
+            try:
+                chunk = np.frombuffer(chunk, dtype=memoryview(chunk).format)
+            except (TypeError, ValueError):
+                return max(chunk)
+        value = chunk.max()
+        return value.item() if isinstance(value, np.generic) else value
+    return max(chunk)
+
+
+def _iter_chunks(source: Any, chunk_size: int) -> Iterator[Any]:
+    """Split `source` into chunks without copying where possible."""
+    if np is not None and isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        for start in range(0, flat.shape[0], chunk_size):
+            yield flat[start:start + chunk_size]
+        return
+    try:
+        view = memoryview(source)
+    except TypeError:
+        view = None
+    if view is not None:
+        if view.ndim != 1:
+            view = view.cast("B").cast(view.format)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+
+    iterator = iter(source)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return
+    if isinstance(first, (str, bytes)) or not hasattr(first, "__iter__"):
+        # a flat stream of values: batch it up
+        iterator = chain([first], iterator)
+        while True:
+            batch = list(islice(iterator, chunk_size))
+            if not batch:
+                return
+            yield batch
+    else:
+        # already chunked; split oversized chunks the same way
+        for chunk in chain([first], iterator):
+            yield from _iter_chunks(chunk, chunk_size)
+
+
+def find_max_chunked(source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """Return the largest value in a large or chunked numeric source.
+
+    `source` may be a NumPy array or np.memmap, an array.array or other
+    buffer, an iterable of chunks (lists, arrays, buffers), or a plain
+    iterable of numbers. Each chunk is reduced by a C loop: NumPy's when it
+    is installed, otherwise the built-in max() over the chunk.
+
+    Raises ValueError if there are no values at all, like
+    find_max_iterative. Note that NumPy propagates NaN, so an array or
+    buffer chunk containing NaN yields nan when NumPy is used.
+    """
+    largest = None
+    for chunk in _iter_chunks(source, chunk_size):
+        if len(chunk) == 0:
+            continue
+        value = _chunk_max(chunk)
+        if largest is None or value > largest:
+            largest = value
+    if largest is None:
+        raise ValueError("find_max_chunked() arg is an empty iterable")
+    return largest
+
+
+def _file_range_max(task: Tuple[str, str, int, int, int]) -> Optional[Any]:
+    """Max of elements [start, stop) of a raw numeric file, or None if empty."""
+    path, dtype, start, stop, chunk_size = task
+    if stop <= start:
+        return None
+    if np is not None:
+        itemsize = np.dtype(dtype).itemsize
+        values = np.memmap(path, dtype=dtype, mode="r", offset=start * itemsize, shape=(stop - start,))
+        return find_max_chunked(values, chunk_size)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # ignore a trailing partial element, as the NumPy branch does
+        itemsize = array(dtype).itemsize
+        raw = memoryview(mm)[:len(mm) - len(mm) % itemsize]
+        view = raw.cast(dtype)
+        try:
+            return find_max_chunked(view[start:stop], chunk_size)
+        finally:
+            view.release()
+            raw.release()
+
+
+def find_max_file(
+    path: str,
+    dtype: str = "d",
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Return the largest value in a raw binary file of `dtype` values.
+
+    The file is memory-mapped, so nothing is read into Python objects up
+    front. `dtype` is an array-module typecode ("d" float64, "f" float32,
+    "q" int64, "i" int32, ...); NumPy accepts the same codes. With
+    `workers` > 1 the file is split into one range per worker. Each worker
+    maps the file itself and only its partial maximum is sent back.
+
+    Raises ValueError for an empty file.
+    """
+    itemsize = array(dtype).itemsize
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        count = f.tell() // itemsize
+    if count == 0:
+        raise ValueError("find_max_file() arg is an empty file")
+    if not workers or workers < 2:
+        return _file_range_max((path, dtype, 0, count, chunk_size))
+
+    step = -(-count // workers)
+    tasks = [(path, dtype, lo, min(lo + step, count), chunk_size) for lo in range(0, count, step)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials: List[Any] = [m for m in pool.map(_file_range_max, tasks) if m is not None]
+    return max(partials)
+
+
+def top_k(nums: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None) -> List[Tuple[int, Any]]:
+    """Return the k largest values of nums as (index, value), largest first.
+
+    Streams are scanned once with a bounded heap (heapq.nlargest), so
+    memory is O(k) and equal values keep their input order. NumPy arrays
+    without a key use np.argpartition instead; their indices are positions
+    in the flattened array, and among values tied with the k-th largest
+    the pick is arbitrary.
+
+    Raises ValueError if k is negative. Returns fewer than k pairs when
+    nums is shorter than k.
+
+    Examples:
+    >>> top_k([3, 1, 4, 1, 5, 9, 2], 3)
+    [(5, 9), (4, 5), (2, 4)]
+    >>> top_k(["bb", "a", "ccc"], 1, key=len)
+    [(2, 'ccc')]
+    """
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    if k == 0:
+        return []
+    if np is not None and key is None and isinstance(nums, np.ndarray):
+        flat = nums.reshape(-1)
+        n = flat.shape[0]
+        idx = np.arange(n) if k >= n else np.argpartition(flat, n - k)[n - k:]
+        # value descending, index ascending among equal values
+        idx = idx[np.lexsort((-idx, flat[idx]))[::-1]]
+        return [(int(i), flat[i].item()) for i in idx]
+    if key is None:
+        return heapq.nlargest(k, enumerate(nums), key=lambda pair: pair[1])
+    return heapq.nlargest(k, enumerate(nums), key=lambda pair: key(pair[1]))
+
+
+def argmax(nums: Iterable[Any], key: Optional[Callable[[Any], Any]] = None) -> Tuple[int, Any]:
+    """Return (index, value) of the first largest value in nums.
+
+    Raises ValueError if nums is empty.
+
+    Examples:
+    >>> argmax([3, 9, 2, 9])
+    (1, 9)
+    """
+    if np is not None and key is None and isinstance(nums, np.ndarray):
+        flat = nums.reshape(-1)
+        if flat.shape[0] == 0:
+            raise ValueError("argmax() arg is an empty iterable")
+        i = int(np.argmax(flat))
+        return i, flat[i].item()
+    if key is None:
+        best = max(enumerate(nums), key=lambda pair: pair[1], default=None)
+    else:
+        best = max(enumerate(nums), key=lambda pair: key(pair[1]), default=None)
+    if best is None:
+        raise ValueError("argmax() arg is an empty iterable")
+    return best
+
+
+def sliding_max(stream: Iterable[Any], window: int) -> Iterator[Any]:
+    """Yield the maximum of every full window of `window` consecutive values.
+
+    Keeps a deque of candidate positions whose values decrease from front
+    to back. Each element is pushed and popped at most once, so the cost is
+    amortised O(1) per element and memory is O(window), however long the
+    stream. For n inputs it yields n - window + 1 values.
+
+    Raises ValueError if window < 1.
+
+    Examples:
+    >>> list(sliding_max([1, 3, 2, 5, 4, 1], 3))
+    [3, 5, 5, 5]
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    candidates: deque = deque()  # (index, value), values decreasing
+    for i, x in enumerate(stream):
+        while candidates and candidates[-1][1] <= x:
+            candidates.pop()
+        candidates.append((i, x))
+        if candidates[0][0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            yield candidates[0][1]
+
+
+def sliding_max_array(values: Any, window: int) -> Any:
+    """Vectorised sliding maximum for in-memory arrays (van Herk/Gil-Werman).
+
+    The input is cut into blocks of `window`. A window then spans the tail
+    of one block and the head of the next, so its max is the larger of a
+    suffix max and a prefix max, both computed with np.maximum.accumulate.
+    O(n) work regardless of the window size.
+
+    Returns a NumPy array of length n - window + 1. Without NumPy it falls
+    back to sliding_max() and returns a list. Raises ValueError if
+    window < 1.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if np is None:
+        return list(sliding_max(values, window))
+    a = np.asarray(values).reshape(-1)
+    n = a.shape[0]
+    if window > n:
+        return a[:0].copy()
+    # pad to whole blocks; padded cells never fall inside a full window
+    blocks = np.pad(a, (0, -n % window), mode="edge").reshape(-1, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(-1)
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+    return np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+
+
 def _demo() -> None:
     samples = [
         [3, 1, 4, 1, 5, 9, 2],
@@ -0,0 +1,162 @@
+"""Regression tests for Assinment2/csv_analytics.py."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Assinment2"))
+
+pd = pytest.importorskip("pandas")
+
+from csv_analytics import analyze_csv, analyze_many, group_stats  # noqa: E402
+
+
+def _means(result):
+    return {col: summary["mean"] for col, summary in result.items()}
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_incremental_survives_blank_line_appends(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n3,4\n")
+    assert _means(analyze_csv(path, incremental=True)) == {"a": 2.0, "b": 3.0}
+
+    _append(path, "\n\n")
+    assert _means(analyze_csv(path, incremental=True)) == {"a": 2.0, "b": 3.0}
+
+    _append(path, "5,6\n")
+    assert _means(analyze_csv(path, incremental=True)) == {"a": 3.0, "b": 4.0}
+    assert _means(analyze_csv(path)) == {"a": 3.0, "b": 4.0}
+
+
+def test_incremental_from_header_only_file(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a,b\n")
+    assert analyze_csv(path, incremental=True) == {}
+
+    _append(path, "1,2\n3,4\n")
+    assert pd.read_csv(path).mean().to_dict() == {"a": 2.0, "b": 3.0}
+    assert _means(analyze_csv(path, incremental=True)) == {"a": 2.0, "b": 3.0}
+
+    _append(path, "5,6\n")
+    assert _means(analyze_csv(path, incremental=True)) == {"a": 3.0, "b": 4.0}
+
+def test_incremental_rebuilds_same_size_rewrite(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a\n" + "1\n" * 40000)
+    assert analyze_csv(path, incremental=True)["a"]["max"] == 1
+
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"9")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    for _ in range(2):
+        result = analyze_csv(path, incremental=True)
+        assert result["a"]["max"] == 9
+        assert result["a"]["mean"] == pytest.approx(1 + 8 / 40000)
+
+
+
+def test_chunked_sums_do_not_overflow_integer_dtypes(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("ts,u\n")
+        for i in range(10):
+            f.write(f"{1_700_000_000_000_000_000 + i},{2**63 + i}\n")
+    means = _means(analyze_csv(path, chunksize=100))
+    assert means["ts"] == pytest.approx(1.7e18)
+    assert means["u"] == pytest.approx(2.0**63)
+
+
+def test_pandas_group_engine_matches_python(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("k,x,y\n")
+        for i in range(500):
+            f.write(f"{'' if i % 97 == 0 else i % 7},{i * 3 - 700},{'' if i % 5 == 0 else i / 8}\n")
+    python = dict(group_stats(path, ["k"], engine="python"))
+    for max_groups in (None, 3):
+        grouped = dict(group_stats(path, ["k"], engine="pandas", chunksize=64, max_groups=max_groups))
+        assert grouped.keys() == python.keys()
+        for key, columns in grouped.items():
+            for col, stats in columns.items():
+                expected = python[key][col]
+                assert stats.count == expected.count
+                assert (stats.min, stats.max) == (expected.min, expected.max)
+                assert stats.mean == pytest.approx(expected.mean)
+                assert stats.variance() == pytest.approx(expected.variance())
+
+
+@pytest.mark.parametrize("text", [
+    "a,b\n1,2,\n3,4,\n",  # trailing comma: implicit index
+    "a,b\nx,2,3\ny,4,5\n",  # text index
+    "a,b\n1,2,5\n3,4\n",  # implicit index with a short row
+    "x,y\n-1,1\n9223372036854775808,2\n",  # int64 and uint64 values: text
+    "x,y\n-0,1\n9223372036854775808,2\n",
+    "x,y\n-1,1\nNA,2\n9223372036854775808,3\n",
+    "x,y\n-1,1\n9223372036854775808,2\n1.5,3\n",  # any float: float64
+    "x,y\n1,1\n9223372036854775808,2\n",  # uint64
+    "x,y\n18446744073709551616,1\n2,2\n",  # beyond uint64: text
+    "x,y\n1_000,1\n2,2\n",  # digit separators: text
+    "x,y\nTrue,1\nFalse,2\n",  # bool is not numeric
+    "x,y\n,1\n,2\n",  # only missing values: float
+    "x,y,z\n1,2\n3,4,5\n",  # short rows are padded
+])
+def test_engines_match_a_full_pandas_read(tmp_path, text):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    numeric = pd.read_csv(path).select_dtypes(include="number")
+    expected = {
+        col: {"mean": values.mean(), "min": values.min(), "max": values.max()}
+        for col, values in numeric.items()
+    }
+    for engine in ("python", "pandas"):
+        result = analyze_csv(path, engine=engine)
+        assert result.keys() == expected.keys()
+        for col, summary in expected.items():
+            for stat, value in summary.items():
+                if value != value:
+                    assert result[col][stat] != result[col][stat]
+                else:
+                    assert result[col][stat] == pytest.approx(value)
+
+
+def test_python_engine_rejects_rows_wider_than_the_first(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n3,4,5\n")
+    with pytest.raises(ValueError, match="Expected 2 fields in line 3"):
+        analyze_csv(path, engine="python")
+
+
+@pytest.mark.parametrize("values, mean", [("inf,1,2,3", float("inf")), ("1,-inf,2,3", float("-inf"))])
+def test_infinite_values_give_the_same_mean_however_split(tmp_path, values, mean):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a\n" + "\n".join(values.split(",")) + "\n")
+    assert pd.read_csv(path)["a"].mean() == mean
+    for kwargs in ({"engine": "python"}, {"engine": "pandas"}, {"chunksize": 1}, {"chunksize": 2}, {"chunksize": 10}):
+        assert analyze_csv(path, **kwargs)["a"]["mean"] == mean
+
+
+def test_analyze_many_counts_a_repeated_path_once(tmp_path):
+    first, second = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+    with open(first, "w", encoding="utf-8") as f:
+        f.write("x\n1\n2\n")
+    with open(second, "w", encoding="utf-8") as f:
+        f.write("x\n10\n")
+    calls = []
+    result = analyze_many([first, second, first], workers=1, progress=lambda *args: calls.append(args))
+    assert list(result["files"]) == [first, second]
+    assert result["global"]["x"]["mean"] == pytest.approx(13 / 3)
+    assert len(calls) == 2